@@ -1,217 +1,378 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_squared_error, r2_score
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-
-st.set_page_config(page_title="Solar Plant Analysis", layout="wide")
-
-st.markdown("""
-    <style>
-        .main {
-            padding: 2rem;
-        }
-        .stPlotly {
-            background-color: #ffffff;
-            border-radius: 5px;
-            padding: 1rem;
-        }
-        .metric-card {
-            background-color: #f0f2f6;
-            padding: 1rem;
-            border-radius: 5px;
-            margin: 0.5rem 0;
-        }
-    </style>
-""", unsafe_allow_html=True)
-
-st.title("☀️ Solar Plant Performance Analytics")
-st.markdown("Interactive dashboard for solar plant performance analysis and prediction")
-
-with st.sidebar:
-    st.header("Data Controls")
-    uploaded_generation = st.file_uploader("Upload Generation Data", type=['csv'])
-    uploaded_weather = st.file_uploader("Upload Weather Data", type=['csv'])
-    
-    if uploaded_generation and uploaded_weather:
-        generation_data = pd.read_csv(uploaded_generation)
-        weather_data = pd.read_csv(uploaded_weather)
-
-        generation_data['DATE_TIME'] = pd.to_datetime(generation_data['DATE_TIME'])
-        weather_data['DATE_TIME'] = pd.to_datetime(weather_data['DATE_TIME'])
-        
-        data = pd.merge(generation_data, weather_data, 
-                       on=['DATE_TIME', 'PLANT_ID'],
-                       how='inner')
-
-        data['hour'] = data['DATE_TIME'].dt.hour
-        data['month'] = data['DATE_TIME'].dt.month
-        data['day_of_week'] = data['DATE_TIME'].dt.dayofweek
-
-        data['DC_POWER'] = pd.to_numeric(data['DC_POWER'], errors='coerce')
-        data.fillna(0, inplace=True)
-
-        features = ['AMBIENT_TEMPERATURE', 'MODULE_TEMPERATURE', 'IRRADIATION',
-                   'hour', 'month', 'day_of_week']
-        X = data[features]
-        y = data['DC_POWER']
-        
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X, y)
-
-        data['predicted_power'] = model.predict(X)
-        data['power_ratio'] = data['DC_POWER'] / (data['predicted_power'] + 1e-6)
-        
-        if 'SOURCE_KEY_x' in data.columns:
-            group_key = 'SOURCE_KEY_x'
-        elif 'SOURCE_KEY_y' in data.columns:
-            group_key = 'SOURCE_KEY_y'
-        else:
-            group_key = 'PLANT_ID'
-    
-        data['power_ratio'] = pd.to_numeric(data['power_ratio'], errors='coerce')
-        data['power_ratio_ma'] = data.groupby(group_key)['power_ratio'].transform(
-            lambda x: x.rolling(window=48, min_periods=1).mean()
-        )
-        
-        st.success("✅ Data loaded and model trained successfully!")
-        
-        st.header("Analysis Controls")
-        cleaning_threshold = st.slider("Cleaning Threshold", 0.5, 1.0, 0.85)
-        std_dev_threshold = st.slider("Fault Detection Threshold (std dev)", 1.0, 5.0, 3.0)
-        sample_size = st.slider("Sample Size for Plots", 1000, 10000, 5000)
-
-if 'data' in locals():
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 Power Generation", "🧹 Maintenance Needs", 
-                                     "⚠️ Fault Detection", "📊 Performance Metrics"])
-    
-    with tab1:
-        st.header("Power Generation Analysis")
-
-        daily_pattern = data.groupby('hour')['DC_POWER'].mean().reset_index()
-        fig_daily = px.line(daily_pattern, x='hour', y='DC_POWER', 
-                           title='Average Daily Power Generation Pattern')
-        fig_daily.update_layout(height=400)
-        st.plotly_chart(fig_daily, use_container_width=True)
-
-        sampled_data = data.sample(n=sample_size, random_state=42)
-        fig_pred = px.scatter(sampled_data, 
-                            x='DC_POWER', 
-                            y='predicted_power',
-                            title='Actual vs Predicted Power Generation')
-
-        max_power = max(sampled_data['DC_POWER'].max(), sampled_data['predicted_power'].max())
-        fig_pred.add_trace(go.Scatter(x=[0, max_power], 
-                                    y=[0, max_power],
-                                    mode='lines', 
-                                    name='Perfect Prediction',
-                                    line=dict(color='red', dash='dash')))
-        
-        fig_pred.update_layout(
-            xaxis_title="Actual Power (DC)",
-            yaxis_title="Predicted Power (DC)",
-            height=500
-        )
-        st.plotly_chart(fig_pred, use_container_width=True)
-
-        importance = pd.DataFrame({
-            'feature': features,
-            'importance': model.feature_importances_
-        }).sort_values('importance', ascending=True)
-        
-        fig_imp = px.bar(importance, x='importance', y='feature', orientation='h',
-                        title='Feature Importance')
-        st.plotly_chart(fig_imp, use_container_width=True)
-    
-    with tab2:
-        st.header("Maintenance Needs Analysis")
-
-        cleaning_needs = data[data['power_ratio_ma'] < cleaning_threshold][
-            ['DATE_TIME', group_key, 'power_ratio_ma']
-        ].drop_duplicates()
-
-        pivot_data = data.pivot_table(values='power_ratio_ma', 
-                                    index=pd.Grouper(key='DATE_TIME', freq='D'),
-                                    columns=group_key,
-                                    aggfunc='mean')
-
-        pivot_data = pivot_data.apply(pd.to_numeric, errors='coerce')
-        
-        fig_heatmap = px.imshow(pivot_data,
-                               title='Panel Performance Heatmap',
-                               color_continuous_scale='RdYlBu')
-        st.plotly_chart(fig_heatmap, use_container_width=True)
-        
-        st.subheader("Panels Needing Maintenance")
-        st.dataframe(cleaning_needs)
-    
-    with tab3:
-        st.header("Fault Detection")
-        
-        panel_stats = data.groupby(group_key).agg({
-            'DC_POWER': ['mean', 'std'],
-            'power_ratio': ['mean', 'std']
-        }).reset_index()
-        
-        panel_stats.columns = [group_key, 'power_mean', 'power_std', 
-                             'ratio_mean', 'ratio_std']
-        
-        power_mean_std = panel_stats['power_mean'].std()
-        ratio_mean_std = panel_stats['ratio_mean'].std()
-        
-        faulty_panels = panel_stats[
-            (abs(panel_stats['power_mean'] - panel_stats['power_mean'].mean()) > 
-             std_dev_threshold * power_mean_std) |
-            (abs(panel_stats['ratio_mean'] - panel_stats['ratio_mean'].mean()) > 
-             std_dev_threshold * ratio_mean_std)
-        ]
-
-        sampled_data_dist = data.sample(n=min(len(data), sample_size))
-        fig_dist = px.box(sampled_data_dist, x=group_key, y='power_ratio',
-                         title='Panel Performance Distribution')
-        st.plotly_chart(fig_dist, use_container_width=True)
-        
-        st.subheader("Potentially Faulty Panels")
-        st.dataframe(faulty_panels)
-    
-    with tab4:
-        st.header("Performance Metrics")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Average Daily Generation", 
-                     f"{data['DC_POWER'].mean():.2f} kW")
-        
-        with col2:
-            st.metric("Peak Generation", 
-                     f"{data['DC_POWER'].max():.2f} kW")
-        
-        with col3:
-            st.metric("Generation Efficiency", 
-                     f"{data['power_ratio'].mean()*100:.1f}%")
-        
-        daily_data = data.resample('D', on='DATE_TIME').mean()
-        fig_ts = px.line(daily_data, 
-                        y='DC_POWER',
-                        title='Daily Power Generation Trend')
-        st.plotly_chart(fig_ts, use_container_width=True)
-        
-        results = pd.DataFrame({
-            'DATE_TIME': data['DATE_TIME'],
-            'PLANT_ID': data['PLANT_ID'],
-            'DC_POWER': data['DC_POWER'],
-            'predicted_power': data['predicted_power'],
-            'power_ratio': data['power_ratio']
-        })
-        
-        st.download_button("Download Results", results.to_csv(), "results.csv")
-
-else:
-    st.info("Upload both generation and weather data to start the analysis.")
+import streamlit as st
+import pandas as pd
+import os
+import time
+
+from cleaning import METHODS as OUTLIER_METHODS, outlier_rows
+from downsample import MODES, box_summary, downsample
+from fleet import fleet_totals, fleet_version, plant_pairs, run_fleet
+from panel_matrix import PanelDayMatrix
+from panel_stats import PanelStats, faulty_panels
+from perf import StageTimer
+from rolling import grouped_rolling
+from schemas import SchemaError
+from solar_data import DATA_DIR, compact_frame, merge_generation_weather
+from solar_model import ENGINES, FEATURES, get_or_train, load, plant_model_key
+from solar_store import IncrementalStore
+
+# Heatmap resolution limit and cleaning table page size for the maintenance tab.
+HEATMAP_DAYS = 120
+HEATMAP_PANELS = 100
+CLEANING_PAGE_ROWS = 50
+
+st.set_page_config(page_title="Solar Plant Analysis", layout="wide")
+timer = StageTimer('app3')
+
+st.markdown("""
+    <style>
+        .main {
+            padding: 2rem;
+        }
+        .stPlotly {
+            background-color: #ffffff;
+            border-radius: 5px;
+            padding: 1rem;
+        }
+        .metric-card {
+            background-color: #f0f2f6;
+            padding: 1rem;
+            border-radius: 5px;
+            margin: 0.5rem 0;
+        }
+    </style>
+""", unsafe_allow_html=True)
+
+st.title("☀️ Solar Plant Performance Analytics")
+st.markdown("Interactive dashboard for solar plant performance analysis and prediction")
+
+with st.sidebar:
+    st.header("Data Controls")
+    fleet_mode = st.toggle("Fleet mode (every plant in a directory)")
+    if fleet_mode:
+        fleet_dir = st.text_input("Plant Directory", DATA_DIR)
+        fleet_workers = st.number_input("Worker Processes", min_value=1, value=os.cpu_count() or 1)
+        uploaded_generation = uploaded_weather = None
+    else:
+        uploaded_generation = st.file_uploader("Upload Generation Data", type=['csv'])
+        uploaded_weather = st.file_uploader("Upload Weather Data", type=['csv'])
+    
+    st.subheader("Model Settings")
+    engine = st.selectbox("Model Engine", list(ENGINES))
+    max_depth = st.slider("Max Tree Depth (0 = unlimited)", 0, 30, 0)
+    max_leaf_nodes = st.slider("Max Leaf Nodes (0 = engine default)", 0, 1000, 0, step=10)
+    model_params = {'engine': engine, 'max_depth': max_depth or None,
+                    'max_leaf_nodes': max_leaf_nodes or None}
+    rolling_window = st.slider("Rolling Window (15-min readings)", 4, 192, 48, step=4)
+    incremental = st.checkbox("Incremental mode (append uploads to the plant store)",
+                              help="New readings are scored with the model the plant store was started "
+                                   "with, so the Model Settings only apply to a new store.")
+    outlier_method = st.selectbox("Exclude Outlier Readings", [None] + list(OUTLIER_METHODS),
+                                  format_func=lambda method: method or "Keep all rows")
+
+    if fleet_mode:
+        st.header("Analysis Controls")
+        cleaning_threshold = st.slider("Cleaning Threshold", 0.5, 1.0, 0.85)
+        std_dev_threshold = st.slider("Fault Detection Threshold (std dev)", 1.0, 5.0, 3.0)
+
+    if uploaded_generation and uploaded_weather:
+        try:
+            data = merge_generation_weather(uploaded_generation, uploaded_weather)
+        except SchemaError as exc:
+            st.error(f"❌ {exc}")
+            timer.report(st)
+            st.stop()
+
+        if 'SOURCE_KEY_x' in data.columns:
+            group_key = 'SOURCE_KEY_x'
+        elif 'SOURCE_KEY_y' in data.columns:
+            group_key = 'SOURCE_KEY_y'
+        else:
+            group_key = 'PLANT_ID'
+
+        if outlier_method:
+            with timer.stage('exclude outliers', rows=len(data)):
+                outliers = outlier_rows(data, outlier_method, by=group_key,
+                                        columns=['DC_POWER', 'AC_POWER', 'AMBIENT_TEMPERATURE',
+                                                 'MODULE_TEMPERATURE', 'IRRADIATION'])
+                data = data[~outliers.to_numpy()].reset_index(drop=True)
+
+        with timer.stage('features', rows=len(data)):
+            data['hour'] = data['DATE_TIME'].dt.hour
+            data['month'] = data['DATE_TIME'].dt.month
+            data['day_of_week'] = data['DATE_TIME'].dt.dayofweek
+
+            # Only numeric gaps read as zero; key and text columns keep their missing values.
+            numeric = data.select_dtypes('number').columns
+            data[numeric] = data[numeric].fillna(0)
+
+        with timer.stage('compact dtypes', rows=len(data)) as record:
+            data, frame_before, frame_after = compact_frame(data)
+            record['bytes_saved'] = frame_before - frame_after
+
+        X = data[FEATURES]
+        y = data['DC_POWER']
+
+        model_key = plant_model_key(uploaded_generation.getvalue(), uploaded_weather.getvalue(),
+                                    model_params, outlier_method)
+        panel_stats = daily_data = None
+
+        if incremental:
+            plants = '_'.join(str(plant) for plant in sorted(data['PLANT_ID'].unique()))
+            store = IncrementalStore(f'plant_{plants}', group_key, rolling_window)
+            training = load(store.model_key, n_rows=None) if store.model_key else None
+            model_reused = training is not None
+            if training is None:
+                with timer.stage('model', rows=len(X)):
+                    training, model_reused = get_or_train(model_key, X, y, model_params)
+                store.model_key = model_key
+            else:
+                # Rescoring with a new model would make the stored ratios incomparable.
+                st.caption(f"Scoring with the {training['metrics']['engine']} model this plant store was "
+                           "started with; the Model Settings apply only to a new store or outside "
+                           "incremental mode.")
+
+            with timer.stage('append to store') as record:
+                new_data = store.new_rows(data).copy()
+                if len(new_data):
+                    new_data['predicted_power'] = training['model'].predict(new_data[FEATURES]).astype('float32')
+                    new_data['power_ratio'] = new_data['DC_POWER'] / (new_data['predicted_power'] + 1e-6)
+                store.append(new_data)
+                record['rows'] = len(new_data)
+            with timer.stage('read store') as record:
+                data = store.frame()
+                panel_stats = store.panel_stats()
+                daily_data = store.daily()
+                record['rows'] = len(data)
+            st.info(f"Appended {len(new_data):,} new rows; the store holds {len(data):,}.")
+        else:
+            with timer.stage('model', rows=len(X)):
+                training, model_reused = get_or_train(model_key, X, y, model_params)
+            data['predicted_power'] = training['predictions'].astype('float32')
+            data['power_ratio'] = data['DC_POWER'] / (data['predicted_power'] + 1e-6)
+            data['power_ratio'] = pd.to_numeric(data['power_ratio'], errors='coerce')
+
+            rolling_key = (model_key, group_key, rolling_window)
+            if st.session_state.get('rolling_key') != rolling_key:
+                with timer.stage('rolling stats', rows=len(data)):
+                    st.session_state['rolling_stats'] = {
+                        stat: values.astype('float32') for stat, values in grouped_rolling(
+                            data['power_ratio'].to_numpy(), data[group_key], rolling_window,
+                            stats=('mean', 'std', 'min')).items()}
+                st.session_state['rolling_key'] = rolling_key
+            rolling_stats = st.session_state['rolling_stats']
+            data['power_ratio_ma'] = rolling_stats['mean']
+            data['power_ratio_std'] = rolling_stats['std']
+            data['power_ratio_min'] = rolling_stats['min']
+
+        if model_reused:
+            st.success("✅ Data loaded and saved model reused!")
+        else:
+            st.success("✅ Data loaded and model trained successfully!")
+        st.caption(f"Merged frame: {frame_after / 2**20:.1f} MB after dtype compaction "
+                   f"({(frame_before - frame_after) / 2**20:.1f} MB saved)")
+        
+        st.header("Analysis Controls")
+        cleaning_threshold = st.slider("Cleaning Threshold", 0.5, 1.0, 0.85)
+        std_dev_threshold = st.slider("Fault Detection Threshold (std dev)", 1.0, 5.0, 3.0)
+        sample_size = st.slider("Points per Plot", 1000, 10000, 5000)
+        downsample_mode = st.selectbox("Downsampling Mode", MODES,
+                                       format_func={'lttb': 'LTTB', 'minmax': 'Min/Max per bucket'}.get)
+
+# Plotly is imported only once there is something to chart, so the upload
+# screen starts without it.
+if fleet_mode:
+    import plotly.express as px
+
+    with timer.stage('fleet'):
+        st.header("Fleet Overview")
+        pairs = plant_pairs(fleet_dir) if os.path.isdir(fleet_dir) else {}
+        if not pairs:
+            st.warning(f"No Plant_<id>_Generation_Data.csv / Weather_Sensor_Data.csv pairs in {fleet_dir}.")
+            timer.report(st)
+            st.stop()
+
+        options = dict(model_params=model_params, rolling_window=rolling_window,
+                       cleaning_threshold=cleaning_threshold, std_dev_threshold=std_dev_threshold)
+        fleet_key = (fleet_version(pairs), repr(options))
+        if st.session_state.get('fleet_key') != fleet_key:
+            with st.spinner(f"Processing {len(pairs)} plants..."), \
+                    timer.stage('process plants', rows=len(pairs)):
+                started = time.perf_counter()
+                st.session_state['fleet'] = run_fleet(pairs, fleet_workers, **options)
+                st.session_state['fleet_wall'] = time.perf_counter() - started
+            st.session_state['fleet_key'] = fleet_key
+        overview, fleet_panels, fleet_daily = st.session_state['fleet']
+
+        totals = fleet_totals(overview)
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Plants", totals['plants'])
+        col2.metric("Panels", f"{totals['panels']:,}")
+        col3.metric("DC Energy", f"{totals['dc_energy_kwh'] / 1000:,.1f} MWh")
+        col4.metric("Mean Power Ratio", f"{totals['mean_power_ratio'] * 100:.1f}%")
+        col5.metric("Faulty Panels", totals['faulty_panels'])
+        if totals['failed']:
+            st.error("Some plants could not be processed: "
+                     + "; ".join(f"{row.PLANT_ID}: {row.error}"
+                                 for row in overview[overview['error'].notna()].itertuples()))
+        st.caption(f"{overview['seconds'].sum():.1f} s of plant processing in "
+                   f"{st.session_state['fleet_wall']:.1f} s wall time on {fleet_workers} worker(s).")
+
+        st.dataframe(overview, hide_index=True)
+        if len(fleet_daily):
+            fig_fleet = px.line(fleet_daily, x='DATE_TIME', y='dc_energy_kwh', color='PLANT_ID',
+                                title='Daily DC Energy by Plant')
+            st.plotly_chart(fig_fleet, use_container_width=True)
+
+            st.subheader("Panels Needing Attention")
+            st.dataframe(fleet_panels[fleet_panels['faulty'] | fleet_panels['needs_cleaning']]
+                         .sort_values('latest_ratio_ma'), hide_index=True)
+
+elif 'data' in locals():
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    tab1, tab2, tab3, tab4 = st.tabs(["📈 Power Generation", "🧹 Maintenance Needs", 
+                                     "⚠️ Fault Detection", "📊 Performance Metrics"])
+    
+    with tab1, timer.stage('tab: power generation'):
+        st.header("Power Generation Analysis")
+
+        daily_pattern = data.groupby('hour')['DC_POWER'].mean().reset_index()
+        fig_daily = px.line(daily_pattern, x='hour', y='DC_POWER', 
+                           title='Average Daily Power Generation Pattern')
+        fig_daily.update_layout(height=400)
+        st.plotly_chart(fig_daily, use_container_width=True)
+
+        sampled_data = downsample(data, 'DC_POWER', 'predicted_power', sample_size, downsample_mode)
+        fig_pred = px.scatter(sampled_data, 
+                            x='DC_POWER', 
+                            y='predicted_power',
+                            title='Actual vs Predicted Power Generation')
+
+        max_power = max(sampled_data['DC_POWER'].max(), sampled_data['predicted_power'].max())
+        fig_pred.add_trace(go.Scatter(x=[0, max_power], 
+                                    y=[0, max_power],
+                                    mode='lines', 
+                                    name='Perfect Prediction',
+                                    line=dict(color='red', dash='dash')))
+        
+        fig_pred.update_layout(
+            xaxis_title="Actual Power (DC)",
+            yaxis_title="Predicted Power (DC)",
+            height=500
+        )
+        st.plotly_chart(fig_pred, use_container_width=True)
+
+        importance = pd.DataFrame({
+            'feature': FEATURES,
+            'importance': training['importances']
+        }).sort_values('importance', ascending=True)
+        
+        fig_imp = px.bar(importance, x='importance', y='feature', orientation='h',
+                        title='Feature Importance')
+        st.plotly_chart(fig_imp, use_container_width=True)
+    
+    with tab2, timer.stage('tab: maintenance'):
+        st.header("Maintenance Needs Analysis")
+
+        matrix_key = (model_key, group_key, rolling_window, len(data))
+        if st.session_state.get('matrix_key') != matrix_key:
+            with timer.stage('daily panel matrix', rows=len(data)):
+                st.session_state['panel_matrix'] = PanelDayMatrix.from_frame(data, group_key, 'power_ratio_ma')
+            st.session_state['matrix_key'] = matrix_key
+        matrix = st.session_state['panel_matrix']
+
+        n_days, n_panels = matrix.shape
+        days = slice(None)
+        if n_days > HEATMAP_DAYS:
+            first, last = st.select_slider("Heatmap Days", options=list(matrix.days.date),
+                                           value=(matrix.days[0].date(), matrix.days[-1].date()))
+            days = slice(matrix.days.get_loc(pd.Timestamp(first)), matrix.days.get_loc(pd.Timestamp(last)) + 1)
+        heatmap = matrix.tile(HEATMAP_DAYS, HEATMAP_PANELS, days)
+        fig_heatmap = px.imshow(heatmap,
+                               title='Panel Performance Heatmap (daily mean rolling ratio)',
+                               color_continuous_scale='RdYlBu', aspect='auto')
+        st.plotly_chart(fig_heatmap, use_container_width=True)
+        if heatmap.shape != matrix.mean[days].shape:
+            st.caption(f"{matrix.mean[days].shape[0]} days x {n_panels} panels averaged into "
+                       f"{heatmap.shape[0]} x {heatmap.shape[1]} blocks; narrow the day range for detail.")
+
+        st.subheader("Panels Needing Maintenance")
+        n_cells = matrix.count_below(cleaning_threshold)
+        pages = max(-(-n_cells // CLEANING_PAGE_ROWS), 1)
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+        cleaning_needs, _ = matrix.below(cleaning_threshold, page - 1, CLEANING_PAGE_ROWS)
+        st.dataframe(cleaning_needs, hide_index=True)
+        st.caption(f"{n_cells:,} panel-days with a daily mean rolling ratio below {cleaning_threshold:.2f}.")
+    
+    with tab3, timer.stage('tab: fault detection'):
+        st.header("Fault Detection")
+        
+        if panel_stats is None:
+            panel_stats = PanelStats.from_frame(data, group_key).to_frame(group_key)
+
+        faulty = faulty_panels(panel_stats, std_dev_threshold)
+
+        dist = box_summary(data, group_key, 'power_ratio')
+        fig_dist = go.Figure(go.Box(x=dist[group_key], q1=dist['q1'], median=dist['median'],
+                                    q3=dist['q3'], mean=dist['mean'],
+                                    lowerfence=dist['lowerfence'], upperfence=dist['upperfence']))
+        fig_dist.update_layout(title='Panel Performance Distribution',
+                               xaxis_title=group_key, yaxis_title='power_ratio')
+        st.plotly_chart(fig_dist, use_container_width=True)
+        
+        st.subheader("Potentially Faulty Panels")
+        st.dataframe(faulty)
+
+        st.subheader(f"Latest Rolling Behaviour ({rolling_window} readings)")
+        latest = data.groupby(group_key, observed=True)[
+            ['DATE_TIME', 'power_ratio_ma', 'power_ratio_std', 'power_ratio_min']].last()
+        st.dataframe(latest.sort_values('power_ratio_ma'))
+    
+    with tab4, timer.stage('tab: performance metrics'):
+        st.header("Performance Metrics")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Average Daily Generation", 
+                     f"{data['DC_POWER'].mean():.2f} kW")
+        
+        with col2:
+            st.metric("Peak Generation", 
+                     f"{data['DC_POWER'].max():.2f} kW")
+        
+        with col3:
+            st.metric("Generation Efficiency", 
+                     f"{data['power_ratio'].mean()*100:.1f}%")
+        
+        st.subheader("Model")
+        metrics = training['metrics']
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Held-out R²", f"{metrics['r2']:.3f}")
+        col2.metric("Held-out RMSE", f"{metrics['rmse']:.1f} kW")
+        col3.metric("Fit Time", f"{metrics['fit_time']:.2f} s")
+        col4.metric("Predict Time", f"{metrics['predict_time']:.2f} s")
+        col5.metric("Model Size", f"{metrics['model_bytes'] / 2**20:.1f} MB")
+
+        if daily_data is None:
+            daily_data = data.resample('D', on='DATE_TIME').mean(numeric_only=True)
+        fig_ts = px.line(daily_data, 
+                        y='DC_POWER',
+                        title='Daily Power Generation Trend')
+        st.plotly_chart(fig_ts, use_container_width=True)
+        
+        results = pd.DataFrame({
+            'DATE_TIME': data['DATE_TIME'],
+            'PLANT_ID': data['PLANT_ID'],
+            'DC_POWER': data['DC_POWER'],
+            'predicted_power': data['predicted_power'],
+            'power_ratio': data['power_ratio']
+        })
+        
+        st.download_button("Download Results", results.to_csv(), "results.csv")
+
+else:
+    st.info("Upload both generation and weather data to start the analysis.")
+
+timer.report(st)
@@ -1,74 +1,174 @@
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-energy_req_df = pd.read_csv('EnergyReq.csv')
-hydro_inflow_gen_df = pd.read_csv('HydroInflowandGen.csv')
-interstate_transfer_df = pd.read_csv('InterstateEnergyTransfer.csv')
-
-st.title('Energy Data Engineering Dashboard')
-
-st.header('Energy Requirement vs Availability for Selected States')
-states_to_plot = st.multiselect('Select States:', energy_req_df['State'].unique(), default=['Andhra Pradesh', 'Assam'])
-fig, ax = plt.subplots()
-for state in states_to_plot:
-    state_data = energy_req_df[energy_req_df['State'] == state]
-    ax.plot(state_data['Year'], state_data['Requirement (MU)'], label=f'{state} Requirement')
-    ax.plot(state_data['Year'], state_data['Availability (MU)'], linestyle='--', label=f'{state} Availability')
-
-ax.set_xlabel('Year')
-ax.set_ylabel('Energy (MU)')
-ax.legend()
-st.pyplot(fig)
-
-st.header('Hydro Inflows vs Generation')
-fig, ax = plt.subplots()
-ax.scatter(hydro_inflow_gen_df['INFLOWS (MCM)'], hydro_inflow_gen_df['GENERATION (GWH)'], color='g', alpha=0.6)
-ax.set_xlabel('Inflows (MCM)')
-ax.set_ylabel('Generation (GWH)')
-st.pyplot(fig)
-
-
-st.header('Interstate Energy Transfer Over Time')
-year_selected = st.slider('Select Year Range', int(interstate_transfer_df['Year'].min()), int(interstate_transfer_df['Year'].max()), (2000, 2010))
-filtered_transfer_df = interstate_transfer_df[(interstate_transfer_df['Year'] >= year_selected[0]) & (interstate_transfer_df['Year'] <= year_selected[1])]
-fig, ax = plt.subplots()
-ax.plot(filtered_transfer_df['Year'], filtered_transfer_df['ENERGRY TRANSFERED (GWH)'], color='b')
-ax.set_xlabel('Year')
-ax.set_ylabel('Energy Transferred (GWH)')
-st.pyplot(fig)
-
-# Total Energy Requirement vs Availability (Bar Plot)
-st.header('Total Energy Requirement vs Availability (All States)')
-total_energy_by_year = energy_req_df.groupby('Year')[['Requirement (MU)', 'Availability (MU)']].sum()
-st.bar_chart(total_energy_by_year)
-
-# Pie Chart - Energy requirement by state for a specific year
-st.header('Energy Requirement Proportion by State for Selected Year')
-year_for_pie = st.selectbox('Select Year:', energy_req_df['Year'].unique())
-energy_by_state_in_year = energy_req_df[energy_req_df['Year'] == year_for_pie]
-fig, ax = plt.subplots()
-ax.pie(energy_by_state_in_year['Requirement (MU)'], labels=energy_by_state_in_year['State'], autopct='%1.1f%%', startangle=90)
-ax.axis('equal')
-st.pyplot(fig)
-
-# Heatmap of Inflow vs Generation
-st.header('Correlation Heatmap: Inflow and Generation Data')
-corr = hydro_inflow_gen_df[['INFLOWS (MCM)', 'GENERATION (GWH)']].corr()
-fig, ax = plt.subplots()
-sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax)
-st.pyplot(fig)
-
-# Energy Prediction for Future Years (Line Plot)
-st.header('Energy Requirement Predictions for 2025-2030')
-predictions = {2025: 30353, 2026: 30885, 2027: 31416, 2028: 31947, 2029: 32478, 2030: 33009}
-fig, ax = plt.subplots()
-ax.plot(list(predictions.keys()), list(predictions.values()), marker='o', linestyle='-', color='r')
-ax.set_xlabel('Year')
-ax.set_ylabel('Predicted Energy Requirement (MU)')
-ax.set_title('Energy Requirement Predictions (2025-2030)')
-st.pyplot(fig)
-
-st.write('Predicted Energy Requirements (MU):')
-st.write(predictions)
+import streamlit as st
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from cleaning import METHODS as OUTLIER_METHODS
+from energy_data import load_energy_store
+from forecasting import METHODS
+from perf import StageTimer
+
+timer = StageTimer('app4')
+timer.section('load store')
+store = load_energy_store()
+
+st.title('Energy Data Engineering Dashboard')
+outlier_method = st.sidebar.selectbox('Exclude Outliers:', [None] + list(OUTLIER_METHODS),
+                                      format_func=lambda method: method or 'Keep all rows')
+hydro_inflow_gen_df = store.hydro
+if outlier_method:
+    hydro_inflow_gen_df = hydro_inflow_gen_df[~store.outliers('hydro', outlier_method)]
+
+timer.section('state lines')
+st.header('Energy Requirement vs Availability for Selected States')
+states_to_plot = st.multiselect('Select States:', store.states, default=['Andhra Pradesh', 'Assam'])
+fig, ax = plt.subplots()
+for state in states_to_plot:
+    years, requirement, availability = store.state_series(state, outlier_method)
+    ax.plot(years, requirement, label=f'{state} Requirement')
+    ax.plot(years, availability, linestyle='--', label=f'{state} Availability')
+
+ax.set_xlabel('Year')
+ax.set_ylabel('Energy (MU)')
+ax.legend()
+st.pyplot(fig)
+
+timer.section('hydro scatter')
+st.header('Hydro Inflows vs Generation')
+fig, ax = plt.subplots()
+ax.scatter(hydro_inflow_gen_df['INFLOWS (MCM)'], hydro_inflow_gen_df['GENERATION (GWH)'], color='g', alpha=0.6)
+ax.set_xlabel('Inflows (MCM)')
+ax.set_ylabel('Generation (GWH)')
+st.pyplot(fig)
+
+
+timer.section('transfer line')
+st.header('Interstate Energy Transfer Over Time')
+year_selected = st.slider('Select Year Range', int(store.transfer_years[0]), int(store.transfer_years[-1]), (2000, 2010))
+filtered_transfer_df = store.transfers_between(*year_selected)
+if outlier_method:
+    filtered_transfer_df = filtered_transfer_df[~store.outliers('transfers', outlier_method)[filtered_transfer_df.index]]
+fig, ax = plt.subplots()
+ax.plot(filtered_transfer_df['Year'], filtered_transfer_df['ENERGRY TRANSFERED (GWH)'], color='b')
+ax.set_xlabel('Year')
+ax.set_ylabel('Energy Transferred (GWH)')
+st.pyplot(fig)
+
+timer.section('transfer network')
+st.header('Interstate Transfer Network')
+graph = store.transfer_graph
+net_flow = graph.net_flow(*year_selected)
+st.subheader(f'Net Import by Entity ({year_selected[0]}-{year_selected[1]})')
+st.bar_chart(net_flow.set_index('Entity')['Net Import (GWH)'])
+st.subheader('Top Transfer Corridors')
+st.dataframe(graph.top_corridors(*year_selected))
+
+span = year_selected[1] - year_selected[0]
+previous = (year_selected[0] - span - 1, year_selected[0] - 1)
+if previous[1] >= graph.years[0]:
+    st.subheader(f'Change vs {previous[0]}-{previous[1]}')
+    net_change, corridor_change = graph.flow_delta(previous, year_selected)
+    col1, col2 = st.columns(2)
+    col1.dataframe(net_change)
+    col2.dataframe(corridor_change)
+
+timer.section('yearly totals')
+# Total Energy Requirement vs Availability (Bar Plot)
+st.header('Total Energy Requirement vs Availability (All States)')
+st.bar_chart(store.totals(outlier_method))
+
+timer.section('state pie')
+# Pie Chart - Energy requirement by state for a specific year
+st.header('Energy Requirement Proportion by State for Selected Year')
+year_for_pie = st.selectbox('Select Year:', store.years)
+pie_states, pie_requirement = store.year_cross_section(year_for_pie, outlier_method=outlier_method)
+fig, ax = plt.subplots()
+ax.pie(pie_requirement, labels=pie_states, autopct='%1.1f%%', startangle=90)
+ax.axis('equal')
+st.pyplot(fig)
+
+timer.section('hydro heatmap')
+# Heatmap of Inflow vs Generation; seaborn is only needed here, so import it late
+# and let the sections above render first.
+import seaborn as sns  # noqa: E402
+st.header('Correlation Heatmap: Inflow and Generation Data')
+corr = hydro_inflow_gen_df[['INFLOWS (MCM)', 'GENERATION (GWH)']].corr()
+fig, ax = plt.subplots()
+sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax)
+st.pyplot(fig)
+
+timer.section('reservoir efficiency')
+st.header('Reservoir Conversion Efficiency')
+hydro = store.hydro_analytics(outlier_method)
+ranked = hydro.summary.sort_values('Efficiency (GWH/MCM)', ascending=False)
+fig, ax = plt.subplots(figsize=(8, max(4, len(ranked) * 0.22)))
+ax.barh(ranked['RESERVOIR SCHEME'], ranked['Efficiency (GWH/MCM)'], color='teal')
+ax.invert_yaxis()
+ax.set_xlabel('Generation per Inflow (GWH/MCM)')
+st.pyplot(fig)
+with st.expander('Per-Reservoir Statistics'):
+    st.dataframe(ranked.round(4), hide_index=True)
+    st.caption('Negative inflow or generation readings (-99999 in the file) are treated as missing.')
+    if len(hydro.duplicates):
+        st.caption('These reservoir-years are reported twice in the file; both rows are summed into one year:')
+        st.dataframe(hydro.duplicates, hide_index=True)
+
+reservoir = st.selectbox('Reservoir:', hydro.reservoirs)
+history = hydro.reservoir(reservoir)
+stats = ranked.set_index('RESERVOIR SCHEME').loc[reservoir]
+col1, col2, col3, col4 = st.columns(4)
+col1.metric('Efficiency', f"{stats['Efficiency (GWH/MCM)']:.3f} GWH/MCM")
+col2.metric('Efficiency Trend', f"{stats['Efficiency Trend (/year)']:+.4f} / year")
+col3.metric('Inflow-Generation R²', f"{stats['R2']:.2f}")
+col4.metric('Years Reported', int(stats['Years']))
+
+col1, col2 = st.columns(2)
+fig, ax = plt.subplots()
+ax.plot(history['Year'], history['Efficiency (GWH/MCM)'], marker='o', color='teal', label='Efficiency')
+ax.set_xlabel('Year')
+ax.set_ylabel('GWH/MCM')
+ax2 = ax.twinx()
+ax2.bar(history['Year'], history['Generation YoY'] * 100, alpha=0.3, color='gray', label='Generation YoY')
+ax2.set_ylabel('Generation change vs previous year (%)')
+ax.set_title(f'{reservoir}: Efficiency and Year-over-Year Generation')
+col1.pyplot(fig)
+
+slope, intercept = hydro.fit_line(reservoir)
+fig, ax = plt.subplots()
+ax.scatter(history['INFLOWS (MCM)'], history['GENERATION (GWH)'], color='g')
+if pd.notna(slope):
+    line_x = np.array([history['INFLOWS (MCM)'].min(), history['INFLOWS (MCM)'].max()])
+    ax.plot(line_x, intercept + slope * line_x, color='r', linestyle='--',
+            label=f'{slope:.3f} GWH/MCM, R² {stats["R2"]:.2f}')
+    ax.legend()
+ax.set_xlabel('Inflows (MCM)')
+ax.set_ylabel('Generation (GWH)')
+ax.set_title(f'{reservoir}: Generation vs Inflow')
+col2.pyplot(fig)
+
+timer.section('forecast')
+# Energy Prediction for Future Years (Line Plot)
+st.header('Energy Requirement Predictions for 2025-2030')
+forecast_years = list(range(2025, 2031))
+forecast_state = st.selectbox('State to Forecast:', store.states)
+forecast_method = st.selectbox('Forecasting Method:', METHODS)
+forecaster = store.forecaster(forecast_method, outlier_method)
+forecasts = pd.DataFrame(forecaster.predict(forecast_years), index=store.states, columns=forecast_years)
+st.caption(f'Fitted {len(store.states)} states with {forecast_method} in {forecaster.fit_seconds * 1000:.1f} ms')
+
+years, requirement, _ = store.state_series(forecast_state, outlier_method)
+fig, ax = plt.subplots()
+ax.plot(years, requirement, marker='.', color='b', label='Reported')
+ax.plot(forecast_years, forecasts.loc[forecast_state], marker='o', linestyle='-', color='r', label='Forecast')
+ax.set_xlabel('Year')
+ax.set_ylabel('Energy Requirement (MU)')
+ax.set_title(f'{forecast_state} Energy Requirement Predictions (2025-2030)')
+ax.legend()
+st.pyplot(fig)
+
+st.write('Predicted Energy Requirements (MU):')
+st.write(forecasts.loc[forecast_state].round(0).to_dict())
+with st.expander('All States'):
+    st.dataframe(forecasts.round(0))
+
+timer.report(st)
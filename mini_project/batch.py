@@ -0,0 +1,178 @@
+"""Headless batch run of app3's analysis over a directory of plants.
+
+Every Plant_<id>_Generation_Data.csv / Weather_Sensor_Data.csv pair is
+scored with the same pipeline as app3 and fleet mode (see ``fleet``), in a
+process pool. Per-reading results (prediction, power ratio, rolling ratio,
+cleaning and fault flags) are written to ``<output>/Plant_<id>_results``
+in ``--chunk-rows`` slices, so the export never builds a second copy of the
+frame as a CSV string. The fleet overview and panel table are written next
+to them. A manifest of input fingerprints makes reruns skip plants whose
+files have not changed, so the command can run from cron or with
+``--interval`` as a loop. Plotly is imported only for ``--charts``, and
+Streamlit never.
+
+Usage: python batch.py [DATA_DIR] [--output batch_results] [--format parquet|csv]
+           [--workers N] [--interval SECONDS] [--charts] [--force]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from solar_model import ENGINES, MODEL_PARAMS
+
+RESULT_COLUMNS = ['DATE_TIME', 'PLANT_ID', 'SOURCE_KEY_x', 'DC_POWER', 'predicted_power', 'power_ratio',
+                  'power_ratio_ma', 'needs_cleaning', 'faulty_panel']
+
+MANIFEST = 'batch_manifest.json'
+
+CHUNK_ROWS = 100_000
+
+DEFAULT_FORMAT = 'parquet' if importlib.util.find_spec('pyarrow') else 'csv'
+
+
+def result_path(output_dir, plant_id, fmt):
+    return os.path.join(output_dir, f'Plant_{plant_id}_results.{fmt}')
+
+
+def write_chunked(df, path, fmt='parquet', chunk_rows=CHUNK_ROWS):
+    """Write ``df`` ``chunk_rows`` rows at a time (one Parquet row group or CSV block each).
+
+    The file is written under a temporary name and renamed when complete.
+    """
+    tmp = path + '.tmp'
+    if fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+        with pq.ParquetWriter(tmp, schema) as writer:
+            for start in range(0, len(df), chunk_rows):
+                writer.write_table(pa.Table.from_pandas(df.iloc[start:start + chunk_rows],
+                                                        schema=schema, preserve_index=False))
+    else:
+        with open(tmp, 'w', newline='') as fh:
+            for start in range(0, len(df), chunk_rows):
+                df.iloc[start:start + chunk_rows].to_csv(fh, header=start == 0, index=False)
+    os.replace(tmp, path)
+
+
+def write_chart(daily, path):
+    import plotly.express as px
+
+    fig = px.line(daily, x='DATE_TIME', y='dc_energy_kwh', title='Daily DC Energy')
+    fig.write_html(path, include_plotlyjs='cdn')
+
+
+def export_plant(plant_id, gen_path, weather_path, output_dir, model_params, rolling_window=48,
+                 cleaning_threshold=0.85, std_dev_threshold=3.0, fmt='parquet', chunk_rows=CHUNK_ROWS,
+                 charts=False):
+    """``fleet.run_fleet`` worker: score one plant and write its per-reading results."""
+    from fleet import GROUP_KEY, score_plant, summarize_plant
+
+    start = time.perf_counter()
+    data, training, reused = score_plant(gen_path, weather_path, model_params, rolling_window)
+    overview, panels, daily = summarize_plant(plant_id, data, training, reused,
+                                              cleaning_threshold, std_dev_threshold)
+
+    data['needs_cleaning'] = (data['power_ratio_ma'] < cleaning_threshold) & (data['IRRADIATION'] > 0)
+    data['faulty_panel'] = data[GROUP_KEY].isin(panels.loc[panels['faulty'], GROUP_KEY])
+    write_chunked(data[RESULT_COLUMNS], result_path(output_dir, plant_id, fmt), fmt, chunk_rows)
+    if charts:
+        write_chart(daily, os.path.join(output_dir, f'Plant_{plant_id}_daily.html'))
+    overview['seconds'] = time.perf_counter() - start
+    return overview, panels, daily
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST)) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST)
+    with open(path + '.tmp', 'w') as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def run_once(args, options):
+    """Process the plants whose inputs or settings changed since the last run; returns the overview."""
+    from fleet import plant_pairs, run_fleet
+    from solar_data import file_fingerprint
+
+    os.makedirs(args.output, exist_ok=True)
+    manifest = _load_manifest(args.output)
+    settings = json.dumps({**options, 'format': args.format}, sort_keys=True)
+    pairs, versions = {}, {}
+    for plant_id, (gen, weather) in plant_pairs(args.data_dir).items():
+        versions[str(plant_id)] = [file_fingerprint(gen), file_fingerprint(weather), settings]
+        done = os.path.exists(result_path(args.output, plant_id, args.format))
+        if args.force or not done or manifest.get(str(plant_id)) != versions[str(plant_id)]:
+            pairs[plant_id] = (gen, weather)
+    if not pairs:
+        print(f'{len(versions)} plants, all up to date')
+        return None
+
+    overview, panels, _ = run_fleet(pairs, args.workers, worker=export_plant, output_dir=args.output,
+                                    fmt=args.format, chunk_rows=args.chunk_rows, charts=args.charts,
+                                    **options)
+    for row in overview.itertuples():
+        if pd.isna(row.error):
+            manifest[str(row.PLANT_ID)] = versions[str(row.PLANT_ID)]
+            print(f'plant {row.PLANT_ID}: {int(row.readings):,} readings, {int(row.faulty_panels)} faulty, '
+                  f'{int(row.panels_needing_cleaning)} need cleaning, {row.seconds:.1f}s')
+        else:
+            print(f'plant {row.PLANT_ID}: FAILED {row.error}', file=sys.stderr)
+    stamp = pd.Timestamp.now().strftime('%Y%m%d-%H%M%S')
+    overview.to_csv(os.path.join(args.output, f'fleet_overview-{stamp}.csv'), index=False)
+    if len(panels):
+        panels.to_csv(os.path.join(args.output, f'fleet_panels-{stamp}.csv'), index=False)
+    _save_manifest(args.output, manifest)
+    return overview
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('data_dir', nargs='?', default=os.environ.get(
+        'SOLAR_DATA_DIR', os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument('--output', default='batch_results')
+    parser.add_argument('--format', choices=['parquet', 'csv'], default=DEFAULT_FORMAT)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per core)')
+    parser.add_argument('--engine', choices=list(ENGINES), default=MODEL_PARAMS['engine'])
+    parser.add_argument('--max-depth', type=int)
+    parser.add_argument('--max-leaf-nodes', type=int)
+    parser.add_argument('--rolling-window', type=int, default=48)
+    parser.add_argument('--cleaning-threshold', type=float, default=0.85)
+    parser.add_argument('--std-dev-threshold', type=float, default=3.0)
+    parser.add_argument('--charts', action='store_true', help='also write a daily energy chart per plant (HTML)')
+    parser.add_argument('--force', action='store_true', help='reprocess plants even if unchanged')
+    parser.add_argument('--interval', type=float, default=0,
+                        help='keep running, checking for changed files every INTERVAL seconds')
+    args = parser.parse_args()
+
+    options = {
+        'model_params': {'engine': args.engine, 'max_depth': args.max_depth,
+                         'max_leaf_nodes': args.max_leaf_nodes},
+        'rolling_window': args.rolling_window,
+        'cleaning_threshold': args.cleaning_threshold,
+        'std_dev_threshold': args.std_dev_threshold,
+    }
+    while True:
+        overview = run_once(args, options)
+        if not args.interval:
+            failed = overview is not None and overview['error'].notna().any()
+            sys.exit(1 if failed else 0)
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
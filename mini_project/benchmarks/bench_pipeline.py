@@ -0,0 +1,250 @@
+"""Time every stage of the dashboard data pipelines on synthetic data.
+
+The solar pipeline follows app2/app3 (load, parse, merge, aggregate, fit,
+render) and the energy pipeline follows app4 (load, aggregate, query, fit,
+render). Each step records wall time and the peak memory it allocated
+(tracemalloc), and the run is written to JSON together with the library
+versions and git commit, so runs at the same scale can be compared.
+
+Usage: python benchmarks/bench_pipeline.py [--inverters 22] [--days 34]
+           [--output pipeline_results.json] [--compare previous.json]
+
+e.g. ``--inverters 50 --days 730`` for a 50-inverter, two-year plant.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows; the per-step tracemalloc peaks are still recorded
+    resource = None
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import matplotlib  # noqa: E402
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import plotly.graph_objects as go  # noqa: E402
+import sklearn  # noqa: E402
+
+from downsample import downsample  # noqa: E402
+from energy_data import HYDRO_FILE, DATA_DIR as ENERGY_DIR, EnergyStore  # noqa: E402
+from panel_stats import PanelStats  # noqa: E402
+from rolling import grouped_rolling  # noqa: E402
+from schemas import parse_timestamps  # noqa: E402
+from solar_data import GEN_COLUMNS, merge_generation_weather  # noqa: E402
+from solar_model import FEATURES, train  # noqa: E402
+from solar_plots import histogram, series_panels  # noqa: E402
+from synthetic import energy_frame, transfer_frame, write_plant  # noqa: E402
+
+
+class Recorder:
+    """Collects one result row per timed step."""
+
+    def __init__(self, trace_memory=True):
+        self.results = []
+        self.trace_memory = trace_memory
+        if trace_memory:
+            tracemalloc.start()
+
+    @contextmanager
+    def step(self, pipeline, stage, name, rows=None):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - base if self.trace_memory else None
+        self.results.append({
+            'pipeline': pipeline, 'stage': stage, 'step': name, 'rows': rows,
+            'seconds': seconds,
+            'peak_mb': None if peak is None else peak / 2 ** 20,
+        })
+        print(f"{pipeline:>7} {stage:>9} {name:<28} {seconds:>9.3f}s"
+              + ('' if peak is None else f' {peak / 2 ** 20:>9.1f} MB'))
+
+
+def _png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def solar_pipeline(rec, directory, args):
+    gen_path, weather_path = write_plant(directory, 4136001, args.inverters, args.days, seed=args.seed)
+
+    with rec.step('solar', 'load', 'generation csv'):
+        generation = pd.read_csv(gen_path, dtype={'SOURCE_KEY': 'category'})
+    with rec.step('solar', 'load', 'weather csv'):
+        weather = pd.read_csv(weather_path, dtype={'SOURCE_KEY': 'category'})
+    with rec.step('solar', 'parse', 'generation DATE_TIME', len(generation)):
+        generation['DATE_TIME'] = parse_timestamps(generation['DATE_TIME'])
+    with rec.step('solar', 'parse', 'weather DATE_TIME', len(weather)):
+        weather['DATE_TIME'] = parse_timestamps(weather['DATE_TIME'])
+
+    with rec.step('solar', 'merge', 'generation x weather', len(generation)):
+        data = merge_generation_weather(gen_path, weather_path)
+    rows = len(data)
+
+    with rec.step('solar', 'aggregate', 'plant totals (app2)', len(generation)):
+        totals = generation.groupby('DATE_TIME', sort=True)[GEN_COLUMNS].sum().reset_index()
+    today = pd.Timestamp('today').normalize()
+    totals['TIME'] = today + (totals['DATE_TIME'] - totals['DATE_TIME'].dt.normalize())
+    with rec.step('solar', 'aggregate', 'daily means (app3)', rows):
+        data.set_index('DATE_TIME').resample('D').mean(numeric_only=True)
+
+    data['hour'] = data['DATE_TIME'].dt.hour
+    data['month'] = data['DATE_TIME'].dt.month
+    data['day_of_week'] = data['DATE_TIME'].dt.dayofweek
+    sample = data.sample(min(rows, args.fit_rows), random_state=args.seed)
+    with rec.step('solar', 'fit', f'{args.engine}', len(sample)):
+        result = train(sample[FEATURES], sample['DC_POWER'], args.engine)
+    with rec.step('solar', 'fit', 'predict all rows', rows):
+        data['predicted_power'] = result['model'].predict(data[FEATURES])
+    data['power_ratio'] = data['DC_POWER'] / (data['predicted_power'] + 1e-6)
+
+    with rec.step('solar', 'aggregate', 'rolling stats', rows):
+        grouped_rolling(data['power_ratio'].to_numpy(), data['SOURCE_KEY_x'], 48, ('mean', 'std', 'min'))
+    with rec.step('solar', 'aggregate', 'panel stats', rows):
+        PanelStats.from_frame(data, 'SOURCE_KEY_x').to_frame('SOURCE_KEY_x')
+
+    with rec.step('solar', 'render', 'series panels png (app2)', len(totals)):
+        _png(series_panels(totals, 1, x='TIME', xlabel='Time of Day', figsize=(10, 8), width_px=1000,
+                           panels=[('DC_POWER', 'red', 'DC Power'), ('AC_POWER', 'blue', 'AC Power')]))
+    with rec.step('solar', 'render', 'histogram png (app2)', len(totals)):
+        _png(histogram(totals, 1, title='Histogram of Power Outputs', xlabel='Power Output',
+                       series=[('DC_POWER', 'red', 'DC Power'), ('AC_POWER', 'blue', 'AC Power')]))
+    with rec.step('solar', 'render', 'lttb scatter json (app3)', rows):
+        points = downsample(data, 'DC_POWER', 'predicted_power', 5000, 'lttb')
+        go.Figure(go.Scattergl(x=points['DC_POWER'], y=points['predicted_power'], mode='markers')).to_json()
+
+
+def energy_pipeline(rec, directory, args):
+    energy_path = os.path.join(directory, 'EnergyReq.csv')
+    transfer_path = os.path.join(directory, 'InterstateEnergyTransfer.csv')
+    energy_frame(args.states, args.years, seed=args.seed).to_csv(energy_path, index=False)
+    transfer_frame(args.entities, args.years, args.transfers_per_year, seed=args.seed).to_csv(
+        transfer_path, index=False)
+
+    with rec.step('energy', 'load', 'energy + transfer csv'):
+        energy = pd.read_csv(energy_path)
+        transfers = pd.read_csv(transfer_path)
+        hydro = pd.read_csv(os.path.join(ENERGY_DIR, HYDRO_FILE))
+    with rec.step('energy', 'aggregate', 'EnergyStore', len(energy)):
+        store = EnergyStore(energy, hydro, transfers)
+    with rec.step('energy', 'aggregate', 'transfer graph', len(transfers)):
+        graph = store.transfer_graph
+
+    rng = np.random.default_rng(args.seed)
+    first, last = int(store.transfer_years[0]), int(store.transfer_years[-1])
+    ranges = np.sort(rng.integers(first, last + 1, (args.queries, 2)), axis=1)
+    with rec.step('energy', 'query', 'state series, all states', len(store.states)):
+        for state in store.states:
+            store.state_series(state)
+    with rec.step('energy', 'query', 'year cross-sections', len(store.years)):
+        for year in store.years:
+            store.year_cross_section(year)
+    with rec.step('energy', 'query', 'transfer ranges', args.queries):
+        for lo, hi in ranges:
+            store.transfers_between(lo, hi)
+            graph.net_flow(lo, hi)
+            graph.top_corridors(lo, hi)
+
+    for method in ('linear', 'holt'):
+        with rec.step('energy', 'fit', f'{method} forecast', len(store.states)):
+            store.forecaster(method).predict(range(2025, 2031))
+
+    with rec.step('energy', 'render', 'state lines png', 10):
+        fig, ax = plt.subplots()
+        for state in store.states[:10]:
+            years, requirement, availability = store.state_series(state)
+            ax.plot(years, requirement)
+            ax.plot(years, availability, linestyle='--')
+        _png(fig)
+    with rec.step('energy', 'render', 'pie png', len(store.states)):
+        fig, ax = plt.subplots()
+        states, values = store.year_cross_section(store.years[-1])
+        ax.pie(values, labels=states)
+        _png(fig)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as fh:
+        baseline = {(r['pipeline'], r['stage'], r['step']): r for r in json.load(fh)['results']}
+    print(f"\n{'step':<46} {'before s':>9} {'after s':>9} {'ratio':>7}")
+    for r in results:
+        before = baseline.get((r['pipeline'], r['stage'], r['step']))
+        if before is None:
+            continue
+        label = f"{r['pipeline']}/{r['stage']}/{r['step']}"
+        ratio = r['seconds'] / before['seconds'] if before['seconds'] else float('nan')
+        print(f"{label:<46} {before['seconds']:>9.3f} {r['seconds']:>9.3f} {ratio:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--inverters', type=int, default=22)
+    parser.add_argument('--days', type=int, default=34)
+    parser.add_argument('--states', type=int, default=44)
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--entities', type=int, default=150)
+    parser.add_argument('--transfers-per-year', type=int, default=50)
+    parser.add_argument('--queries', type=int, default=50, help='transfer year ranges to query')
+    parser.add_argument('--engine', default='Random Forest')
+    parser.add_argument('--fit-rows', type=int, default=100_000, help='training sample size')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help='keep the generated CSVs here instead of a temp dir')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (lower overhead)')
+    parser.add_argument('--output', default='pipeline_results.json')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    args = parser.parse_args()
+
+    rec = Recorder(trace_memory=not args.no_memory)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.data_dir or tmp
+        solar_pipeline(rec, directory, args)
+        energy_pipeline(rec, directory, args)
+
+    report = {
+        'created': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'config': vars(args),
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'numpy': np.__version__, 'pandas': pd.__version__,
+                        'scikit-learn': sklearn.__version__},
+        # ru_maxrss is in KiB on Linux.
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+        'results': rec.results,
+    }
+    with open(args.output, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    print(f'\nwrote {args.output}')
+    if args.compare:
+        compare(rec.results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark grouped rolling power-ratio statistics against the lambda path.
+
+Usage: python benchmarks/bench_rolling.py [--readings 3264] [--window 48]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rolling import grouped_rolling  # noqa: E402
+
+INVERTER_COUNTS = [20, 50, 100, 200, 500]
+
+
+def synthetic_ratios(inverters, readings, seed=0):
+    """Time-major frame like the merged upload: one row per inverter per 15 minutes."""
+    rng = np.random.default_rng(seed)
+    keys = np.array([f'INV{i:04d}' for i in range(inverters)])
+    return pd.DataFrame({
+        'SOURCE_KEY_x': pd.Categorical(np.tile(keys, readings)),
+        'power_ratio': rng.normal(1.0, 0.1, inverters * readings),
+    })
+
+
+def lambda_path(df, window):
+    return df.groupby('SOURCE_KEY_x', observed=True)['power_ratio'].transform(
+        lambda x: x.rolling(window=window, min_periods=1).mean()
+    ).to_numpy()
+
+
+def vectorized_path(df, window):
+    return grouped_rolling(df['power_ratio'].to_numpy(), df['SOURCE_KEY_x'], window)['mean']
+
+
+def best_of(func, repeats, *args):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readings', type=int, default=34 * 96, help='readings per inverter')
+    parser.add_argument('--window', type=int, default=48)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'inverters':>9} {'rows':>10} {'lambda s':>10} {'vector s':>10} {'speedup':>8} {'max diff':>10}")
+    for inverters in INVERTER_COUNTS:
+        df = synthetic_ratios(inverters, args.readings)
+        slow, expected = best_of(lambda_path, args.repeats, df, args.window)
+        fast, result = best_of(vectorized_path, args.repeats, df, args.window)
+        diff = np.max(np.abs(expected - result))
+        print(f'{inverters:>9} {len(df):>10} {slow:>10.3f} {fast:>10.3f} {slow / fast:>7.1f}x {diff:>10.2e}')
+
+
+if __name__ == '__main__':
+    main()
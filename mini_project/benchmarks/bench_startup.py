@@ -0,0 +1,130 @@
+"""Cold-start cost of each dashboard, broken down by import.
+
+For every app this runs, in fresh interpreters:
+
+* ``python -X importtime`` over the imports at the top of the app, reporting
+  the cumulative time of each import statement (what a new server process
+  pays before the script body starts);
+* the app's first script run under ``streamlit.testing`` (no uploads), timed
+  around ``AppTest.run()``, which includes those imports plus any done
+  lazily while the page renders.
+
+Each measurement is the median of ``--repeat`` runs. Results are printed as
+a Markdown table (as in the README) and optionally written to JSON.
+
+Usage: python benchmarks/bench_startup.py [--repeat 5] [--apps app2 app3 app4]
+           [--output startup_results.json]
+
+app2 needs plant CSVs: point SOLAR_DATA_DIR at them.
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+
+FIRST_RUN = """
+import sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+start = time.perf_counter()
+at.run()
+print(time.perf_counter() - start)
+"""
+
+
+def module_imports(path):
+    """The import statements at the top of the app, before its first other statement, as source."""
+    with open(path) as fh:
+        tree = ast.parse(fh.read())
+    statements = []
+    for node in tree.body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            break
+        statements.append(ast.unparse(node))
+    return statements
+
+
+def _statement_modules(statement):
+    node = ast.parse(statement).body[0]
+    if isinstance(node, ast.Import):
+        return [alias.name for alias in node.names]
+    return [node.module]
+
+
+def import_times(statements):
+    """{import statement: cumulative seconds} from one ``-X importtime`` run."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', '\n'.join(statements)],
+                            cwd=APP_DIR, capture_output=True, text=True, check=True)
+    # Lines read "import time: self [us] | cumulative | name"; a top-level
+    # import has no indentation before its name and is listed after its children.
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, total, name = line.split('|')
+        if not name[1:].startswith(' '):
+            cumulative[name.strip()] = int(total) / 1e6
+    times = {}
+    for statement in statements:
+        # A module already imported by an earlier statement is not listed again.
+        times[statement] = sum(cumulative.pop(module, 0.0) for module in _statement_modules(statement)
+                               for module in _parents(module))
+    return times
+
+
+def _parents(module):
+    parts = module.split('.')
+    return ['.'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def first_run_seconds(app):
+    result = subprocess.run([sys.executable, '-c', FIRST_RUN, os.path.join(APP_DIR, app)],
+                            cwd=APP_DIR, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure(app, repeat):
+    statements = module_imports(os.path.join(APP_DIR, app))
+    runs = [import_times(statements) for _ in range(repeat)]
+    imports = {statement: statistics.median(run[statement] for run in runs) for statement in statements}
+    return {
+        'imports': imports,
+        'import_total': sum(imports.values()),
+        'first_run': statistics.median(first_run_seconds(app) for _ in range(repeat)),
+    }
+
+
+def markdown(results, top=6):
+    lines = ['| app | module imports (s) | first run (s) | slowest imports |', '|---|---:|---:|---|']
+    for app, r in results.items():
+        slowest = sorted(r['imports'].items(), key=lambda item: -item[1])[:top]
+        detail = ', '.join(f'`{statement}` {seconds:.2f}' for statement, seconds in slowest if seconds >= 0.01)
+        lines.append(f"| {app} | {r['import_total']:.2f} | {r['first_run']:.2f} | {detail} |")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--apps', nargs='+', default=['app2.py', 'app3.py', 'app4.py'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='also write the results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for app in args.apps:
+        app = app if app.endswith('.py') else app + '.py'
+        results[app] = measure(app, args.repeat)
+    print(markdown(results))
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
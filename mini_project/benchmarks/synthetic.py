@@ -0,0 +1,140 @@
+"""Synthetic datasets with the same schemas as the CSVs shipped with the dashboards.
+
+* ``generation_frame`` / ``weather_frame`` - Plant_*_Generation_Data.csv and
+  Plant_*_Weather_Sensor_Data.csv: 15-minute readings, a diurnal
+  irradiation curve, per-inverter capacity and occasional dropouts;
+* ``energy_frame`` - EnergyReq.csv: state x year requirement/availability;
+* ``transfer_frame`` - InterstateEnergyTransfer.csv: supplier -> purchaser
+  transfers per year.
+
+Everything is generated with NumPy in one shot and is reproducible for a
+given seed, so timings at a given scale are comparable across versions.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+FREQ_MINUTES = 15
+START = pd.Timestamp('2020-05-15')
+
+# Plant 1 ships day-first timestamps, plant 2 ISO ones.
+DATE_FORMATS = {'iso': '%Y-%m-%d %H:%M:%S', 'dayfirst': '%d-%m-%Y %H:%M'}
+
+
+def _keys(rng, n, length=15):
+    alphabet = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'))
+    return [''.join(row) for row in rng.choice(alphabet, size=(n, length))]
+
+
+def _timestamps(days):
+    return pd.date_range(START, periods=days * 24 * 60 // FREQ_MINUTES, freq=f'{FREQ_MINUTES}min')
+
+
+def _irradiation(times, rng):
+    """Clear-sky bell between 06:00 and 18:00 scaled by a per-day cloudiness factor."""
+    hours = times.hour.to_numpy() + times.minute.to_numpy() / 60
+    sun = np.clip(np.sin((hours - 6) / 12 * np.pi), 0, None)
+    cloud = rng.uniform(0.5, 1.0, len(times) // (24 * 60 // FREQ_MINUTES) + 1)
+    day = (times.normalize() - times[0].normalize()).days.to_numpy()
+    return sun * cloud[day] * rng.uniform(0.9, 1.1, len(times))
+
+
+def weather_frame(days, plant_id=4136001, date_format='iso', seed=0):
+    rng = np.random.default_rng(seed)
+    times = _timestamps(days)
+    irradiation = _irradiation(times, rng)
+    ambient = 25 + 8 * irradiation + rng.normal(0, 1, len(times))
+    return pd.DataFrame({
+        'DATE_TIME': times.strftime(DATE_FORMATS[date_format]),
+        'PLANT_ID': plant_id,
+        'SOURCE_KEY': _keys(rng, 1)[0],
+        'AMBIENT_TEMPERATURE': ambient,
+        'MODULE_TEMPERATURE': ambient + 25 * irradiation + rng.normal(0, 1, len(times)),
+        'IRRADIATION': irradiation,
+    })
+
+
+def generation_frame(inverters, days, plant_id=4136001, date_format='iso', dropout=0.01, seed=0):
+    """Time-major readings, one row per inverter per timestamp.
+
+    The irradiation curve is the one ``weather_frame`` draws for the same
+    seed, so merged data has a learnable power/irradiation relationship.
+    A ``dropout`` share of rows is removed, like the gaps in the real files.
+    """
+    rng = np.random.default_rng(seed)
+    times = _timestamps(days)
+    irradiation = _irradiation(times, rng)
+    rng = np.random.default_rng(seed + 1)
+    capacity = rng.uniform(1100, 1400, inverters)
+    dc = (irradiation[:, None] * capacity[None, :]
+          * rng.normal(1.0, 0.03, (len(times), inverters))).clip(0, None)
+    # A few inverters underperform, which the fault views should pick up.
+    dc[:, rng.choice(inverters, max(1, inverters // 20), replace=False)] *= 0.7
+    ac = dc * 0.975
+
+    per_day = 24 * 60 // FREQ_MINUTES
+    day = np.arange(len(times)) // per_day
+    energy = ac * FREQ_MINUTES / 60
+    cumulative = np.cumsum(energy, axis=0)
+    day_start = np.vstack([np.zeros((1, inverters)), cumulative[per_day - 1::per_day]])
+    daily_yield = cumulative - day_start[day]
+    total_yield = rng.uniform(6e6, 7.5e6, inverters)[None, :] + cumulative
+
+    out = pd.DataFrame({
+        'DATE_TIME': np.repeat(times.strftime(DATE_FORMATS[date_format]), inverters),
+        'PLANT_ID': plant_id,
+        'SOURCE_KEY': np.tile(np.array(_keys(rng, inverters), dtype=object), len(times)),
+        'DC_POWER': dc.ravel(),
+        'AC_POWER': ac.ravel(),
+        'DAILY_YIELD': daily_yield.ravel(),
+        'TOTAL_YIELD': total_yield.ravel(),
+    })
+    return out[rng.random(len(out)) >= dropout].reset_index(drop=True)
+
+
+def energy_frame(states, years, first_year=1992, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f'State {i:03d}' for i in range(states)]
+    year = np.arange(first_year, first_year + years)
+    base = rng.lognormal(8, 1.2, states)
+    growth = rng.uniform(1.02, 1.09, states)
+    requirement = base[:, None] * growth[:, None] ** (year - first_year)[None, :]
+    requirement *= rng.normal(1.0, 0.03, requirement.shape)
+    availability = requirement * rng.uniform(0.85, 1.0, requirement.shape)
+    return pd.DataFrame({
+        'Year': np.tile(year, states),
+        'State': np.repeat(names, years),
+        'Requirement (MU)': requirement.ravel().round(1),
+        'Availability (MU)': availability.ravel().round(1),
+    })
+
+
+def transfer_frame(entities, years, transfers_per_year, first_year=1985, seed=0):
+    rng = np.random.default_rng(seed)
+    names = np.array([f'Utility {i:03d} S.E.B.' for i in range(entities)], dtype=object)
+    n = years * transfers_per_year
+    supplier = rng.integers(0, entities, n)
+    purchaser = (supplier + rng.integers(1, entities, n)) % entities
+    return pd.DataFrame({
+        'Year': np.repeat(np.arange(first_year, first_year + years), transfers_per_year),
+        'NAME OF SUPPLIER': names[supplier],
+        'NAME OF PURCHASER': names[purchaser],
+        'ENERGRY TRANSFERED (GWH)': rng.lognormal(4, 1.5, n).round(2),
+    })
+
+
+def write_plant(directory, plant_id, inverters, days, date_format='iso', seed=0):
+    """Write a Plant_<id>_Generation_Data.csv / Weather_Sensor pair; returns both paths.
+
+    ``date_format`` applies to the generation file only; weather files are
+    always ISO, as in the shipped data.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for kind, frame in (('Generation', generation_frame(inverters, days, plant_id, date_format, seed=seed)),
+                        ('Weather_Sensor', weather_frame(days, plant_id, seed=seed))):
+        path = os.path.join(directory, f'Plant_{plant_id}_{kind}_Data.csv')
+        frame.to_csv(path, index=False)
+        paths.append(path)
+    return tuple(paths)
@@ -0,0 +1,95 @@
+"""Outlier masks for numeric columns, computed without copying the frame.
+
+Three rules are evaluated for every selected column at once, optionally
+within groups (per state, per reservoir, per inverter):
+
+* ``zscore`` - ``|x - mean| / std`` above the threshold (population std,
+  as ``scipy.stats.zscore``);
+* ``iqr`` - outside ``[Q1 - k * IQR, Q3 + k * IQR]``;
+* ``mad`` - modified z-score ``0.6745 * |x - median| / MAD`` above the
+  threshold (Iglewicz and Hoaglin).
+
+Each column is sorted by (group, value) once; every group's quantiles then
+come from index arithmetic on the sorted values instead of a groupby.
+NaN readings are ignored by the statistics and never flagged. The result
+is a boolean frame, so callers keep using their own data with
+``df[~mask]``.
+"""
+import numpy as np
+import pandas as pd
+
+METHODS = {'zscore': 3.0, 'iqr': 1.5, 'mad': 3.5}
+
+
+def _group_codes(df, by):
+    if by is None:
+        return np.zeros(len(df), dtype=np.int64), 1
+    codes = df.groupby(by, sort=False, dropna=False).ngroup().to_numpy()
+    return codes, int(codes.max()) + 1 if len(codes) else 0
+
+
+def _sorted_quantiles(values, codes, starts, counts, qs):
+    """Per-group quantiles (linear interpolation) of one column, shape (groups, len(qs))."""
+    # Group by group, ascending within a group, NaN last.
+    ordered = values[np.lexsort((values, codes))]
+    if not len(ordered):
+        return np.full((len(starts), len(qs)), np.nan)
+    pos = starts[:, None] + np.asarray(qs)[None, :] * np.maximum(counts - 1, 0)[:, None]
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, starts[:, None] + np.maximum(counts - 1, 0)[:, None])
+    lo, hi = np.minimum(lo, len(ordered) - 1), np.minimum(hi, len(ordered) - 1)
+    out = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+    out[counts == 0] = np.nan
+    return out
+
+
+def outlier_masks(df, columns=None, by=None, methods=tuple(METHODS), thresholds=None):
+    """Boolean frame with one column per (method, column); True marks an outlier.
+
+    ``columns`` defaults to every numeric column not used for grouping,
+    ``by`` is anything ``DataFrame.groupby`` accepts, and ``thresholds``
+    overrides entries of ``METHODS``.
+    """
+    by_columns = [] if by is None else [by] if isinstance(by, str) else list(by)
+    if columns is None:
+        columns = [c for c in df.select_dtypes('number').columns if c not in by_columns]
+    columns = list(columns)
+    limits = {**METHODS, **(thresholds or {})}
+    unknown = [method for method in methods if method not in METHODS]
+    if unknown:
+        raise ValueError(f'unknown outlier methods {unknown}; choose from {list(METHODS)}')
+
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    codes, n_groups = _group_codes(df, by)
+    starts = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=n_groups))[:-1]])
+    valid = ~np.isnan(values)
+
+    flags = {method: np.zeros(values.shape, dtype=bool) for method in methods}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for j in range(len(columns)):
+            x, ok = values[:, j], valid[:, j]
+            counts = np.bincount(codes[ok], minlength=n_groups)
+            if 'zscore' in flags:
+                mean = np.bincount(codes[ok], weights=x[ok], minlength=n_groups) / counts
+                dev = np.where(ok, x - mean[codes], 0.0)
+                std = np.sqrt(np.bincount(codes, weights=dev * dev, minlength=n_groups) / counts)
+                flags['zscore'][:, j] = np.abs(dev) > limits['zscore'] * std[codes]
+            if 'iqr' in flags or 'mad' in flags:
+                q1, median, q3 = _sorted_quantiles(x, codes, starts, counts, (0.25, 0.5, 0.75)).T
+            if 'iqr' in flags:
+                spread = limits['iqr'] * (q3 - q1)
+                flags['iqr'][:, j] = (x < (q1 - spread)[codes]) | (x > (q3 + spread)[codes])
+            if 'mad' in flags:
+                dev = np.abs(x - median[codes])
+                mad = _sorted_quantiles(dev, codes, starts, counts, (0.5,))[:, 0]
+                flags['mad'][:, j] = (mad[codes] > 0) & (0.6745 * dev > limits['mad'] * mad[codes])
+
+    return pd.DataFrame(np.hstack([flags[method] for method in methods]), index=df.index,
+                        columns=pd.MultiIndex.from_product([list(methods), columns]))
+
+
+def outlier_rows(df, method='zscore', columns=None, by=None, threshold=None):
+    """Row mask: True where any selected column is an outlier under ``method``."""
+    thresholds = None if threshold is None else {method: threshold}
+    masks = outlier_masks(df, columns, by, methods=(method,), thresholds=thresholds)
+    return masks[method].any(axis=1)
@@ -0,0 +1,107 @@
+"""Server-side reduction of large series before they are sent to a chart.
+
+Two point-selection modes are offered, both sized to a target number of
+points (roughly the plot's pixel width):
+
+* ``lttb`` - Largest-Triangle-Three-Buckets, keeps the visual shape.
+* ``minmax`` - the lowest and highest point of every bucket, so peaks and
+  night-time zeros always survive.
+"""
+import numpy as np
+
+MODES = ['lttb', 'minmax']
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points LTTB keeps; ``x`` must be sorted."""
+    x = _as_float(x)
+    y = _as_float(y)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # Interior points are split into n_out - 2 buckets; first and last are kept.
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            avg_x = x[stop:edges[i + 2]].mean()
+            avg_y = y[stop:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def minmax_indices(x, y, n_out):
+    """Indices of each bucket's min and max of ``y``, over equal-width x buckets."""
+    x = _as_float(x)
+    y = _as_float(y)
+    n = len(x)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    span = x.max() - x.min()
+    if span == 0:
+        bucket = np.zeros(n, dtype=np.int64)
+    else:
+        bucket = np.minimum(((x - x.min()) / span * n_buckets).astype(np.int64), n_buckets - 1)
+    order = np.lexsort((y, bucket))
+    sorted_bucket = bucket[order]
+    first = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+    last = np.r_[first[1:] - 1, n - 1]
+    return np.unique(np.r_[order[first], order[last], 0, n - 1])
+
+
+def downsample(df, x, y, n_out, mode='lttb'):
+    """Rows of ``df`` to plot for ``y`` (one column or several) against ``x``.
+
+    Rows are sorted by ``x``; with several ``y`` columns the kept rows are the
+    union of what each column needs. Rows with a missing ``x`` or ``y`` are
+    dropped.
+    """
+    columns = [y] if isinstance(y, str) else list(y)
+    data = df.dropna(subset=[x] + columns).sort_values(x, kind='stable')
+    if len(data) <= n_out:
+        return data
+    pick = lttb_indices if mode == 'lttb' else minmax_indices
+    per_column = max(n_out // len(columns), 3)
+    keep = np.unique(np.concatenate([pick(data[x].to_numpy(), data[c].to_numpy(), per_column)
+                                     for c in columns]))
+    return data.iloc[keep]
+
+
+def box_summary(df, group, value):
+    """Per-group quartiles and Tukey fences, for drawing box plots from stats."""
+    grouped = df.groupby(group, observed=True)[value]
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'median', 'q3']
+    stats['mean'] = grouped.mean()
+    iqr = stats['q3'] - stats['q1']
+    lo = stats['q1'] - 1.5 * iqr
+    hi = stats['q3'] + 1.5 * iqr
+    bounds = df[[group, value]].join(lo.rename('lo'), on=group).join(hi.rename('hi'), on=group)
+    inside = bounds[(bounds[value] >= bounds['lo']) & (bounds[value] <= bounds['hi'])]
+    fences = inside.groupby(group, observed=True)[value].agg(['min', 'max'])
+    stats['lowerfence'] = fences['min']
+    stats['upperfence'] = fences['max']
+    return stats.reset_index()
+
+
+def sample_for_width(df, x, y, width_px, mode='minmax'):
+    """Downsample to about two points per horizontal pixel."""
+    return downsample(df, x, y, max(int(width_px) * 2, 3), mode)
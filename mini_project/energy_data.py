@@ -0,0 +1,159 @@
+"""Load-once aggregate store behind the energy dashboard (app4).
+
+The three CSVs are read once per file version. Everything the widgets ask
+for is precomputed from them:
+
+* a state x year cube of requirement and availability, so a state's
+  series or a year's cross-section is one array slice;
+* interstate transfers sorted by year, so a year range is two
+  ``searchsorted`` calls and a slice;
+* yearly totals for the all-states bar chart;
+* the supplier -> purchaser transfer graph, built on first use;
+* requirement forecasters, fitted for all states once per method and
+  outlier rule;
+* outlier masks per table and rule, with statistics taken per state and
+  per reservoir, and a copy of the cube with the energy outliers blanked
+  out per rule;
+* per-reservoir hydro efficiency, trends and fits, once per outlier rule.
+"""
+import os
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+from cleaning import outlier_rows
+from forecasting import TrendForecaster
+from hydro import HydroAnalytics
+from perf import stage, timed
+from schemas import read_csv
+from solar_data import file_fingerprint
+from transfer_graph import TransferGraph
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ENERGY_FILE = 'EnergyReq.csv'
+HYDRO_FILE = 'HydroInflowandGen.csv'
+TRANSFER_FILE = 'InterstateEnergyTransfer.csv'
+
+MEASURES = ['Requirement (MU)', 'Availability (MU)']
+TRANSFER_COLUMN = 'ENERGRY TRANSFERED (GWH)'
+
+# table -> (value columns, grouping column) for outlier detection.
+OUTLIER_SCOPES = {
+    'energy': (MEASURES, 'State'),
+    'hydro': (['INFLOWS (MCM)', 'GENERATION (GWH)'], 'RESERVOIR SCHEME'),
+    'transfers': ([TRANSFER_COLUMN], None),
+}
+
+
+class EnergyStore:
+    """Precomputed views over the energy requirement, hydro and transfer data."""
+
+    def __init__(self, energy, hydro, transfers):
+        self.energy = energy
+        self.hydro = hydro
+
+        self.states = np.array(sorted(energy['State'].unique()), dtype=object)
+        self.years = np.sort(energy['Year'].unique())
+        self._state_index = {state: i for i, state in enumerate(self.states)}
+        # A few states report a year twice; the cube keeps the later row.
+        kept = ~energy.duplicated(['State', 'Year'], keep='last').to_numpy()
+        unique = energy[kept]
+        state_idx = np.searchsorted(self.states, unique['State'].to_numpy(dtype=object))
+        year_idx = np.searchsorted(self.years, unique['Year'].to_numpy())
+        # measure x state x year
+        self.cube = np.full((len(MEASURES), len(self.states), len(self.years)), np.nan)
+        for m, measure in enumerate(MEASURES):
+            self.cube[m, state_idx, year_idx] = unique[measure].to_numpy(dtype=np.float64)
+        # Energy row behind each filled cell, so an outlier rule can blank its cells.
+        self._cells = (np.flatnonzero(kept), state_idx, year_idx)
+
+        self.yearly_totals = energy.groupby('Year')[MEASURES].sum()
+
+        self.transfers = transfers.sort_values('Year', kind='stable').reset_index(drop=True)
+        self.transfer_years = self.transfers['Year'].to_numpy()
+        self._forecasters = {}
+        self._outliers = {}
+        self._hydro = {}
+        self._cubes = {None: self.cube}
+
+    @cached_property
+    def transfer_graph(self):
+        return TransferGraph(self.transfers)
+
+    def energy_cube(self, outlier_method=None):
+        """The measure x state x year cube, with cells from ``outlier_method``'s outlier rows set to NaN."""
+        if outlier_method not in self._cubes:
+            rows, state_idx, year_idx = self._cells
+            outlier = self.outliers('energy', outlier_method)[rows]
+            cube = self.cube.copy()
+            cube[:, state_idx[outlier], year_idx[outlier]] = np.nan
+            self._cubes[outlier_method] = cube
+        return self._cubes[outlier_method]
+
+    def totals(self, outlier_method=None):
+        """Requirement and availability summed over states per year, like ``yearly_totals``."""
+        if outlier_method is None:
+            return self.yearly_totals
+        energy = self.energy[~self.outliers('energy', outlier_method)]
+        return energy.groupby('Year')[MEASURES].sum()
+
+    def forecaster(self, method='linear', outlier_method=None):
+        """Requirement forecaster for every state, fitted on first use per method and outlier rule."""
+        if (method, outlier_method) not in self._forecasters:
+            with stage(f'fit {method} forecaster', rows=len(self.states)):
+                self._forecasters[method, outlier_method] = TrendForecaster(
+                    self.states, self.years, self.energy_cube(outlier_method)[0], method)
+        return self._forecasters[method, outlier_method]
+
+    def outliers(self, table, method):
+        """Cached row mask (NumPy) of ``table``'s outliers under a ``cleaning.METHODS`` rule."""
+        if (table, method) not in self._outliers:
+            columns, by = OUTLIER_SCOPES[table]
+            rows = outlier_rows(getattr(self, table), method, columns, by)
+            self._outliers[table, method] = rows.to_numpy()
+        return self._outliers[table, method]
+
+    def hydro_analytics(self, outlier_method=None):
+        """HydroAnalytics over the hydro rows, without the outliers of ``outlier_method`` if given."""
+        if outlier_method not in self._hydro:
+            hydro = self.hydro if outlier_method is None else self.hydro[~self.outliers('hydro', outlier_method)]
+            with stage('hydro analytics', rows=len(hydro)):
+                self._hydro[outlier_method] = HydroAnalytics(hydro)
+        return self._hydro[outlier_method]
+
+    def state_series(self, state, outlier_method=None):
+        """Years with data for ``state`` and the matching requirement/availability arrays."""
+        values = self.energy_cube(outlier_method)[:, self._state_index[state], :]
+        present = ~np.isnan(values).all(axis=0)
+        return self.years[present], values[0, present], values[1, present]
+
+    def year_cross_section(self, year, measure='Requirement (MU)', outlier_method=None):
+        """States reporting ``measure`` in ``year`` and their values."""
+        column = np.searchsorted(self.years, year)
+        if column == len(self.years) or self.years[column] != year:
+            return self.states[:0], np.empty(0)
+        values = self.energy_cube(outlier_method)[MEASURES.index(measure), :, column]
+        present = ~np.isnan(values)
+        return self.states[present], values[present]
+
+    def transfers_between(self, first_year, last_year):
+        """Transfer rows with first_year <= Year <= last_year, as a slice of the sorted frame."""
+        lo = np.searchsorted(self.transfer_years, first_year, side='left')
+        hi = np.searchsorted(self.transfer_years, last_year, side='right')
+        return self.transfers.iloc[lo:hi]
+
+
+@lru_cache(maxsize=4)
+@timed('load energy csvs')
+def _load(versions):
+    frames = [read_csv(os.path.join(DATA_DIR, name), os.path.splitext(name)[0])
+              for name in (ENERGY_FILE, HYDRO_FILE, TRANSFER_FILE)]
+    return EnergyStore(*frames)
+
+
+def load_energy_store():
+    """Shared EnergyStore, rebuilt only when one of the CSVs changes."""
+    versions = tuple(file_fingerprint(os.path.join(DATA_DIR, name))
+                     for name in (ENERGY_FILE, HYDRO_FILE, TRANSFER_FILE))
+    return _load(versions)
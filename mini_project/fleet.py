@@ -0,0 +1,175 @@
+"""Fleet mode: run app3's per-plant pipeline over a directory of plants.
+
+Every ``Plant_<id>_Generation_Data.csv`` with a matching
+``Plant_<id>_Weather_Sensor_Data.csv`` is one plant. Each plant is handled
+by a worker process (merge, features, model fit or reuse, power ratio,
+rolling ratio, panel statistics) that sends back only compact summaries:
+one overview row, one row per panel and one row per day. The parent
+concatenates them, so memory stays at one plant per worker and throughput
+grows with the number of cores. Models go through the same train-once
+registry as app3, so a plant already analysed there is not refitted.
+"""
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import solar_model
+from panel_stats import PanelStats, faulty_panels
+from rolling import grouped_rolling
+from solar_data import DATA_DIR, compact_frame, file_fingerprint, merge_generation_weather
+from solar_model import FEATURES, MODEL_PARAMS, get_or_train, plant_model_key
+
+GROUP_KEY = 'SOURCE_KEY_x'
+
+# Energy of one 15-minute reading in kWh per kW.
+READING_HOURS = 0.25
+
+
+def plant_pairs(directory=DATA_DIR):
+    """{plant id: (generation path, weather path)} for every complete pair in ``directory``."""
+    pairs = {}
+    for path in glob.glob(os.path.join(directory, 'Plant_*_Generation_Data.csv')):
+        match = re.search(r'Plant_(\d+)_', os.path.basename(path))
+        weather = os.path.join(directory, f'Plant_{match.group(1)}_Weather_Sensor_Data.csv') if match else None
+        if weather and os.path.exists(weather):
+            pairs[int(match.group(1))] = (path, weather)
+    return dict(sorted(pairs.items()))
+
+
+def fleet_version(pairs):
+    """Changes whenever any plant file in ``pairs`` changes."""
+    return tuple((plant, file_fingerprint(gen), file_fingerprint(weather))
+                 for plant, (gen, weather) in pairs.items())
+
+
+def _limit_threads():
+    # One model per process; letting every worker's forest use all cores oversubscribes.
+    solar_model.N_JOBS = 1
+
+
+def _read_bytes(path):
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+
+def score_plant(gen_path, weather_path, model_params=MODEL_PARAMS, rolling_window=48):
+    """app3's pipeline for one file pair; returns (scored frame, training result, model reused).
+
+    The frame has predicted_power, power_ratio and power_ratio_ma added.
+    """
+    data = merge_generation_weather(gen_path, weather_path)
+    data['hour'] = data['DATE_TIME'].dt.hour
+    data['month'] = data['DATE_TIME'].dt.month
+    data['day_of_week'] = data['DATE_TIME'].dt.dayofweek
+    # As in app3, only numeric gaps are filled.
+    numeric = data.select_dtypes('number').columns
+    data[numeric] = data[numeric].fillna(0)
+    data, _, _ = compact_frame(data)
+
+    key = plant_model_key(_read_bytes(gen_path), _read_bytes(weather_path), model_params)
+    training, reused = get_or_train(key, data[FEATURES], data['DC_POWER'], model_params)
+    data['predicted_power'] = training['predictions'].astype('float32')
+    data['power_ratio'] = data['DC_POWER'] / (data['predicted_power'] + 1e-6)
+    data['power_ratio_ma'] = grouped_rolling(data['power_ratio'].to_numpy(), data[GROUP_KEY],
+                                             rolling_window)['mean'].astype('float32')
+    return data, training, reused
+
+
+def summarize_plant(plant_id, data, training, reused, cleaning_threshold=0.85, std_dev_threshold=3.0):
+    """(overview row dict, panel frame, daily frame) for a frame from ``score_plant``."""
+    panels = PanelStats.from_frame(data, GROUP_KEY).to_frame(GROUP_KEY)
+    # Files end at night, when every ratio is near zero; judge each panel by its last daylight reading.
+    daylight = data[data['IRRADIATION'] > 0]
+    latest = daylight.groupby(GROUP_KEY, observed=True)['power_ratio_ma'].last()
+    panels['latest_ratio_ma'] = latest.reindex(panels[GROUP_KEY]).to_numpy()
+    panels['faulty'] = panels.index.isin(faulty_panels(panels, std_dev_threshold).index)
+    panels['needs_cleaning'] = panels['latest_ratio_ma'] < cleaning_threshold
+    panels.insert(0, 'PLANT_ID', plant_id)
+
+    daily = data.resample('D', on='DATE_TIME').agg(
+        {'DC_POWER': 'sum', 'AC_POWER': 'sum', 'power_ratio': 'mean'}).reset_index()
+    daily[['DC_POWER', 'AC_POWER']] *= READING_HOURS
+    daily = daily.rename(columns={'DC_POWER': 'dc_energy_kwh', 'AC_POWER': 'ac_energy_kwh'})
+    daily.insert(0, 'PLANT_ID', plant_id)
+
+    metrics = training['metrics']
+    overview = {
+        'PLANT_ID': plant_id,
+        'panels': len(panels),
+        'readings': len(data),
+        'first': data['DATE_TIME'].min(),
+        'last': data['DATE_TIME'].max(),
+        'dc_energy_kwh': float(daily['dc_energy_kwh'].sum()),
+        'ac_energy_kwh': float(daily['ac_energy_kwh'].sum()),
+        'mean_power_ratio': float(data['power_ratio'].mean()),
+        'faulty_panels': int(panels['faulty'].sum()),
+        'panels_needing_cleaning': int(panels['needs_cleaning'].sum()),
+        'r2': metrics['r2'],
+        'rmse': metrics['rmse'],
+        'model_reused': reused,
+        'error': None,
+    }
+    return overview, panels, daily
+
+
+def process_plant(plant_id, gen_path, weather_path, model_params=MODEL_PARAMS,
+                  rolling_window=48, cleaning_threshold=0.85, std_dev_threshold=3.0):
+    """Score and summarize one plant; the default ``run_fleet`` worker."""
+    start = time.perf_counter()
+    data, training, reused = score_plant(gen_path, weather_path, model_params, rolling_window)
+    overview, panels, daily = summarize_plant(plant_id, data, training, reused,
+                                              cleaning_threshold, std_dev_threshold)
+    overview['seconds'] = time.perf_counter() - start
+    return overview, panels, daily
+
+
+def run_fleet(pairs, max_workers=None, worker=process_plant, **options):
+    """Process every plant in ``pairs`` (see ``plant_pairs``) in a process pool.
+
+    Returns (overview, panels, daily) frames with a PLANT_ID column. A plant
+    whose files fail schema validation, or whose worker raises anything
+    else, gets an overview row with ``error`` set instead of stopping the
+    fleet. ``worker`` is called as
+    ``worker(plant_id, gen_path, weather_path, **options)`` in a child
+    process and returns what ``process_plant`` returns.
+    """
+    rows, panels, daily = [], [], []
+    max_workers = min(max_workers or os.cpu_count() or 1, max(len(pairs), 1))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_limit_threads) as pool:
+        futures = {pool.submit(worker, plant_id, gen, weather, **options): plant_id
+                   for plant_id, (gen, weather) in pairs.items()}
+        for future in as_completed(futures):
+            try:
+                row, plant_panels, plant_daily = future.result()
+            except Exception as exc:
+                # One bad plant (schema, model or worker failure) must not stop the fleet.
+                rows.append({'PLANT_ID': futures[future], 'error': str(exc) or type(exc).__name__})
+                continue
+            rows.append(row)
+            panels.append(plant_panels)
+            daily.append(plant_daily)
+
+    overview = pd.DataFrame(rows).sort_values('PLANT_ID', ignore_index=True)
+    if 'error' not in overview.columns:
+        overview['error'] = None
+    panels = pd.concat(panels, ignore_index=True) if panels else pd.DataFrame()
+    daily = pd.concat(daily, ignore_index=True) if daily else pd.DataFrame()
+    return overview, panels, daily
+
+
+def fleet_totals(overview):
+    """Fleet-wide headline numbers from the overview frame."""
+    ok = overview[overview['error'].isna()]
+    return {
+        'plants': len(ok),
+        'failed': len(overview) - len(ok),
+        'panels': int(ok['panels'].sum()) if len(ok) else 0,
+        'dc_energy_kwh': float(ok['dc_energy_kwh'].sum()) if len(ok) else 0.0,
+        'mean_power_ratio': float(np.average(ok['mean_power_ratio'], weights=ok['readings'])) if len(ok) else np.nan,
+        'faulty_panels': int(ok['faulty_panels'].sum()) if len(ok) else 0,
+    }
@@ -0,0 +1,140 @@
+"""Per-region trend forecasts fitted for every region at once.
+
+Series are rows of a regions x years matrix, with NaN where a region did
+not report. The built-in methods are vectorized across regions:
+
+* ``linear`` - least-squares trend line per row, closed form;
+* ``exponential`` - least-squares trend on log values (constant growth rate);
+* ``holt`` - Holt's linear exponential smoothing, with alpha/beta picked
+  per row from a small grid by one-step-ahead error. All grid points and
+  rows are updated together, one year at a time.
+
+``arima`` fits statsmodels' ARIMA(1,1,0) row by row when statsmodels is
+installed; it is imported on the first ARIMA fit.
+"""
+import importlib.util
+import time
+
+import numpy as np
+
+# statsmodels is slow to import, so only check that it is installed here.
+HAS_STATSMODELS = importlib.util.find_spec('statsmodels') is not None
+
+METHODS = ['linear', 'exponential', 'holt'] + (['arima'] if HAS_STATSMODELS else [])
+
+SMOOTHING_GRID = np.linspace(0.1, 0.9, 9)
+
+
+def _least_squares(x, Y):
+    """Slope and intercept of every row of ``Y`` against ``x``, ignoring NaN."""
+    w = ~np.isnan(Y)
+    y = np.where(w, Y, 0.0)
+    n = w.sum(axis=1)
+    sx = (w * x).sum(axis=1)
+    sy = y.sum(axis=1)
+    sxx = (w * x * x).sum(axis=1)
+    sxy = (y * x).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        denom = n * sxx - sx * sx
+        slope = np.where(denom > 0, (n * sxy - sx * sy) / denom, 0.0)
+        intercept = (sy - slope * sx) / n
+    return slope, intercept
+
+
+def _holt(Y, alphas, betas):
+    """Level/trend at the last year and one-step SSE for every (alpha, beta) pair and row.
+
+    ``alphas``/``betas`` have shape (k, 1); the state arrays have shape
+    (k, rows). A row starts at its first reported value, takes its initial
+    trend from the second, and in years it did not report the level moves
+    along the trend without a correction.
+    """
+    k, rows = alphas.shape[0], Y.shape[0]
+    level = np.full((k, rows), np.nan)
+    trend = np.zeros((k, rows))
+    sse = np.zeros((k, rows))
+    seen = np.zeros(rows, dtype=bool)
+    trended = np.zeros(rows, dtype=bool)
+    for t in range(Y.shape[1]):
+        y = Y[:, t]
+        valid = ~np.isnan(y)
+        first = valid & ~seen
+        second = valid & seen & ~trended
+        update = valid & trended
+
+        forecast = level + trend
+        error = np.where(update, y - forecast, 0.0)
+        sse += error * error
+        new_level = np.where(update, forecast + alphas * error, forecast)
+        trend = np.where(update, betas * (new_level - level) + (1 - betas) * trend, trend)
+        trend[:, second] = y[second] - level[:, second]
+        new_level[:, second | first] = y[second | first]
+        level = new_level
+
+        seen |= valid
+        trended |= second
+    return level, trend, sse
+
+
+class TrendForecaster:
+    """Fitted trend parameters for many regions; call ``predict`` for any horizon."""
+
+    def __init__(self, regions, years, Y, method='linear'):
+        if method not in METHODS:
+            raise ValueError(f'unknown forecasting method {method!r}; choose from {METHODS}')
+        self.regions = np.asarray(regions)
+        self.years = np.asarray(years, dtype=np.float64)
+        self.method = method
+        Y = np.asarray(Y, dtype=np.float64)
+        start = time.perf_counter()
+        getattr(self, f'_fit_{method}')(Y)
+        self.fit_seconds = time.perf_counter() - start
+
+    def _fit_linear(self, Y):
+        self.slope, self.intercept = _least_squares(self.years, Y)
+
+    def _fit_exponential(self, Y):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            logs = np.where(Y > 0, np.log(Y), np.nan)
+        self.slope, self.intercept = _least_squares(self.years, logs)
+
+    def _fit_holt(self, Y):
+        alphas, betas = np.meshgrid(SMOOTHING_GRID, SMOOTHING_GRID, indexing='ij')
+        alphas, betas = alphas.reshape(-1, 1), betas.reshape(-1, 1)
+        level, trend, sse = _holt(Y, alphas, betas)
+        best = np.argmin(sse, axis=0)
+        rows = np.arange(Y.shape[0])
+        self.alpha, self.beta = alphas[best, 0], betas[best, 0]
+        self.level, self.trend = level[best, rows], trend[best, rows]
+
+    def _fit_arima(self, Y):
+        from statsmodels.tsa.arima.model import ARIMA
+
+        self.models = []
+        for row in Y:
+            valid = ~np.isnan(row)
+            if valid.sum() < 4:
+                self.models.append(None)
+                continue
+            self.models.append((self.years[valid][-1], ARIMA(row[valid], order=(1, 1, 0)).fit()))
+
+    def predict(self, horizon_years):
+        """Forecast matrix of shape (regions, len(horizon_years))."""
+        h = np.asarray(horizon_years, dtype=np.float64)
+        if self.method == 'linear':
+            return self.intercept[:, None] + self.slope[:, None] * h
+        if self.method == 'exponential':
+            return np.exp(self.intercept[:, None] + self.slope[:, None] * h)
+        if self.method == 'holt':
+            return self.level[:, None] + self.trend[:, None] * (h - self.years[-1])
+        out = np.full((len(self.regions), len(h)), np.nan)
+        for i, fitted in enumerate(self.models):
+            if fitted is None:
+                continue
+            last_year, model = fitted
+            steps = int(h.max() - last_year)
+            if steps > 0:
+                path = model.forecast(steps)
+                ahead = (h - last_year).astype(int) - 1
+                out[i, ahead >= 0] = path[ahead[ahead >= 0]]
+        return out
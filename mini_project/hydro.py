@@ -0,0 +1,141 @@
+"""Per-reservoir analytics over HydroInflowandGen.csv.
+
+Negative readings (the file's -99999 placeholder) are treated as missing
+and excluded from every statistic, and a reservoir-year reported twice is
+summed into one row. Rows are then sorted by (reservoir, year) once, so
+every reservoir is one contiguous block and ``offsets[i]:offsets[i + 1]``
+is reservoir ``i``.
+Per-reservoir sums come from ``np.add.reduceat`` over those offsets, so the
+conversion efficiency (GWh generated per MCM of inflow), the
+generation ~ inflow regression and correlation, and the efficiency trend
+over years are computed for all reservoirs in one pass, with no Python loop
+over groups. Year-over-year changes compare each row with the previous
+row of the same block.
+"""
+import numpy as np
+import pandas as pd
+
+RESERVOIR = 'RESERVOIR SCHEME'
+INFLOW = 'INFLOWS (MCM)'
+GENERATION = 'GENERATION (GWH)'
+
+
+def _segment_sum(values, offsets):
+    return np.add.reduceat(values, offsets[:-1]) if len(values) else np.zeros(len(offsets) - 1)
+
+
+def _fit(x, y, valid, offsets):
+    """Per-block least-squares slope/intercept of y on x and Pearson r, over rows where ``valid``.
+
+    Deviations are taken from each block's mean (two passes), which keeps
+    large inflow values from cancelling out in the sums of squares.
+    """
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    n = _segment_sum(valid.astype(np.float64), offsets)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = _segment_sum(x, offsets) / n
+        mean_y = _segment_sum(y, offsets) / n
+    sizes = np.diff(offsets)
+    dx = np.where(valid, x - np.repeat(mean_x, sizes), 0.0)
+    dy = np.where(valid, y - np.repeat(mean_y, sizes), 0.0)
+    sxx = _segment_sum(dx * dx, offsets)
+    syy = _segment_sum(dy * dy, offsets)
+    sxy = _segment_sum(dx * dy, offsets)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where((n >= 2) & (sxx > 0), sxy / sxx, np.nan)
+        r = np.where((n >= 2) & (sxx > 0) & (syy > 0), sxy / np.sqrt(sxx * syy), np.nan)
+    return n, slope, mean_y - slope * mean_x, r
+
+
+class HydroAnalytics:
+    """Reservoir-indexed hydro table with per-reservoir statistics precomputed."""
+
+    def __init__(self, hydro):
+        names = hydro[RESERVOIR].astype(str).str.strip()
+        frame = pd.DataFrame({RESERVOIR: names, 'Year': hydro['Year'].to_numpy(),
+                              INFLOW: hydro[INFLOW].to_numpy(dtype=np.float64),
+                              GENERATION: hydro[GENERATION].to_numpy(dtype=np.float64)})
+        # The file marks a missing reading with -99999; no real inflow or generation is negative.
+        values = frame[[INFLOW, GENERATION]]
+        frame[[INFLOW, GENERATION]] = values.where(values >= 0)
+
+        # A few reservoirs report a year twice with different figures. Neither row is
+        # more plausible than the other, so both count: they are summed into one
+        # reservoir-year (missing if either is) and listed in ``duplicates``.
+        repeated = frame.duplicated([RESERVOIR, 'Year'], keep=False)
+        self.duplicates = frame[repeated].sort_values([RESERVOIR, 'Year'], kind='stable').reset_index(drop=True)
+        if repeated.any():
+            grouped = frame.groupby([RESERVOIR, 'Year'], sort=False)[[INFLOW, GENERATION]]
+            complete = grouped.count().eq(grouped.size(), axis=0)
+            frame = grouped.sum(min_count=1).where(complete).reset_index()
+
+        self.reservoirs, codes = np.unique(frame[RESERVOIR].to_numpy(dtype=object), return_inverse=True)
+        order = np.lexsort((frame['Year'].to_numpy(), codes))
+        codes = codes[order]
+        self.offsets = np.searchsorted(codes, np.arange(len(self.reservoirs) + 1))
+        self._index = {name: i for i, name in enumerate(self.reservoirs)}
+
+        self.year = frame['Year'].to_numpy()[order]
+        self.inflow = frame[INFLOW].to_numpy()[order]
+        self.generation = frame[GENERATION].to_numpy()[order]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.efficiency = np.where(self.inflow > 0, self.generation / self.inflow, np.nan)
+
+        # Year-over-year: each row against the previous row of the same reservoir.
+        first = np.zeros(len(codes), dtype=bool)
+        first[self.offsets[:-1]] = True
+        prev = np.r_[0, np.arange(len(codes) - 1)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.yoy_generation = np.where(first, np.nan, self.generation / self.generation[prev] - 1)
+            self.yoy_efficiency = np.where(first, np.nan, self.efficiency - self.efficiency[prev])
+        self.summary = self._summarize()
+
+    def _summarize(self):
+        offsets = self.offsets
+        valid = ~np.isnan(self.inflow) & ~np.isnan(self.generation)
+        n, slope, intercept, r = _fit(self.inflow, self.generation, valid, offsets)
+        has_efficiency = ~np.isnan(self.efficiency)
+        _, trend, _, _ = _fit(self.year.astype(np.float64), self.efficiency, has_efficiency, offsets)
+        total_inflow = _segment_sum(np.where(valid, self.inflow, 0.0), offsets)
+        total_generation = _segment_sum(np.where(valid, self.generation, 0.0), offsets)
+        # Pooled efficiency only counts years with a positive inflow, like the yearly ratios.
+        positive_inflow = _segment_sum(np.where(has_efficiency, self.inflow, 0.0), offsets)
+        positive_generation = _segment_sum(np.where(has_efficiency, self.generation, 0.0), offsets)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pooled = np.where(positive_inflow > 0, positive_generation / positive_inflow, np.nan)
+            mean_efficiency = (_segment_sum(np.where(has_efficiency, self.efficiency, 0.0), offsets)
+                               / _segment_sum(has_efficiency.astype(np.float64), offsets))
+        return pd.DataFrame({
+            RESERVOIR: self.reservoirs,
+            'Years': n.astype(np.int64),
+            'First Year': self.year[offsets[:-1]],
+            'Last Year': self.year[offsets[1:] - 1],
+            'Total Inflow (MCM)': total_inflow,
+            'Total Generation (GWH)': total_generation,
+            'Efficiency (GWH/MCM)': pooled,
+            'Mean Yearly Efficiency': mean_efficiency,
+            'Efficiency Trend (/year)': trend,
+            'Slope (GWH/MCM)': slope,
+            'Intercept (GWH)': intercept,
+            'Correlation': r,
+            'R2': r * r,
+        })
+
+    def reservoir(self, name):
+        """One reservoir's years as a frame, with efficiency and year-over-year columns."""
+        i = self._index[name]
+        rows = slice(self.offsets[i], self.offsets[i + 1])
+        return pd.DataFrame({
+            'Year': self.year[rows],
+            INFLOW: self.inflow[rows],
+            GENERATION: self.generation[rows],
+            'Efficiency (GWH/MCM)': self.efficiency[rows],
+            'Generation YoY': self.yoy_generation[rows],
+            'Efficiency YoY': self.yoy_efficiency[rows],
+        })
+
+    def fit_line(self, name):
+        """(slope, intercept) of the reservoir's generation ~ inflow regression."""
+        row = self.summary.iloc[self._index[name]]
+        return row['Slope (GWH/MCM)'], row['Intercept (GWH)']
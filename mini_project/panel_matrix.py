@@ -0,0 +1,97 @@
+"""Daily panel x day matrix behind the maintenance tab.
+
+``PanelDayMatrix`` holds the daily mean of one value (the rolling power
+ratio) for every panel as a dense days x panels NumPy array, built once
+with ``np.bincount`` instead of a ``pivot_table`` per rerun. Threshold
+queries are a boolean mask over that array, ``tile`` block-averages any
+window of it down to a size a heatmap can draw, and ``below`` returns one
+page of the matching (day, panel) cells at a time.
+"""
+import numpy as np
+import pandas as pd
+
+
+class PanelDayMatrix:
+    __slots__ = ('days', 'panels', 'mean', 'count')
+
+    def __init__(self, days, panels, mean, count):
+        self.days = days
+        self.panels = panels
+        self.mean = mean
+        self.count = count
+
+    @classmethod
+    def from_frame(cls, df, group_key, value):
+        day_codes, days = pd.factorize(df['DATE_TIME'].dt.floor('D'), sort=True)
+        keys = df[group_key]
+        if isinstance(keys.dtype, pd.CategoricalDtype):
+            keys = keys.cat.remove_unused_categories()
+            panel_codes, panels = keys.cat.codes.to_numpy(), keys.cat.categories
+        else:
+            panel_codes, panels = pd.factorize(keys, sort=True)
+        values = df[value].to_numpy(dtype=np.float64)
+        valid = (day_codes >= 0) & (panel_codes >= 0) & ~np.isnan(values)
+        cells = day_codes[valid].astype(np.int64) * len(panels) + panel_codes[valid]
+        size = len(days) * len(panels)
+        count = np.bincount(cells, minlength=size).reshape(len(days), len(panels))
+        total = np.bincount(cells, weights=values[valid], minlength=size).reshape(count.shape)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, total / count, np.nan)
+        return cls(pd.DatetimeIndex(days, name='DATE'), pd.Index(panels, name=group_key), mean, count)
+
+    @property
+    def shape(self):
+        return self.mean.shape
+
+    def to_frame(self):
+        """The matrix as a day-indexed frame, one column per panel (as ``pivot_table`` gives)."""
+        return pd.DataFrame(self.mean, index=self.days, columns=self.panels)
+
+    def tile(self, max_days, max_panels, days=None):
+        """Block means of the matrix (or the ``days`` slice of it) in at most max_days x max_panels cells.
+
+        Returns a frame labelled by each block's first day and first panel.
+        """
+        days = days or slice(None)
+        mean, count = self.mean[days], self.count[days]
+        labels_day, labels_panel = self.days[days], self.panels
+        row_starts = _block_starts(mean.shape[0], max_days)
+        col_starts = _block_starts(mean.shape[1], max_panels)
+        if len(row_starts) == 0 or len(col_starts) == 0:
+            return pd.DataFrame(mean, index=labels_day, columns=labels_panel)
+        # Weighting by readings makes each block the mean over its raw readings.
+        weight = count.astype(np.float64)
+        total = np.nan_to_num(mean) * weight
+        total = np.add.reduceat(np.add.reduceat(total, row_starts, axis=0), col_starts, axis=1)
+        weight = np.add.reduceat(np.add.reduceat(weight, row_starts, axis=0), col_starts, axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            blocks = np.where(weight > 0, total / weight, np.nan)
+        return pd.DataFrame(blocks, index=labels_day[row_starts], columns=labels_panel[col_starts])
+
+    def count_below(self, threshold):
+        return int(np.count_nonzero(self.mean < threshold))
+
+    def below(self, threshold, page=0, page_rows=50):
+        """(page of cells whose daily mean is under ``threshold``, number of such cells).
+
+        Cells are ordered lowest mean first.
+        """
+        flat = np.flatnonzero(self.mean < threshold)
+        order = np.argsort(self.mean.ravel()[flat], kind='stable')
+        pick = flat[order[page * page_rows:(page + 1) * page_rows]]
+        day, panel = np.divmod(pick, self.mean.shape[1])
+        page_frame = pd.DataFrame({
+            'DATE': self.days[day],
+            self.panels.name: self.panels[panel],
+            'daily_mean': self.mean[day, panel],
+            'readings': self.count[day, panel],
+        })
+        return page_frame, len(flat)
+
+
+def _block_starts(n, max_blocks):
+    """Start offsets splitting ``n`` rows into at most ``max_blocks`` near-equal blocks."""
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    blocks = min(n, max(max_blocks, 1))
+    return np.unique((np.arange(blocks) * n) // blocks)
@@ -0,0 +1,125 @@
+"""Streaming per-panel statistics for fault detection.
+
+``PanelStats`` holds running count, mean and M2 (sum of squared deviations,
+Welford) of DC power and power ratio for every inverter in flat NumPy
+arrays. It can be fed one reading at a time or whole batches, and shards
+can be merged (Chan et al.), so the fault table refreshes in O(panels)
+from the accumulated state instead of a groupby over all history.
+"""
+import numpy as np
+import pandas as pd
+
+METRICS = {'DC_POWER': 'power', 'power_ratio': 'ratio'}
+
+
+class PanelStats:
+    __slots__ = ('keys', '_index', 'count', 'mean', 'm2')
+
+    def __init__(self):
+        self.keys = []
+        self._index = {}
+        # One row per panel, one column per metric in METRICS order.
+        self.count = np.zeros((0, len(METRICS)))
+        self.mean = np.zeros((0, len(METRICS)))
+        self.m2 = np.zeros((0, len(METRICS)))
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _rows_for(self, keys):
+        """State row of every key, growing the arrays for unseen panels."""
+        new = [key for key in keys if key not in self._index]
+        if new:
+            for key in new:
+                self._index[key] = len(self.keys)
+                self.keys.append(key)
+            pad = np.zeros((len(new), len(METRICS)))
+            self.count = np.vstack([self.count, pad])
+            self.mean = np.vstack([self.mean, pad])
+            self.m2 = np.vstack([self.m2, pad])
+        return np.array([self._index[key] for key in keys], dtype=np.int64)
+
+    def _combine(self, rows, count, mean, m2):
+        """Merge per-row partial (count, mean, M2) into the state."""
+        n_a = self.count[rows]
+        total = n_a + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean - self.mean[rows]
+            share = np.where(total > 0, count / total, 0.0)
+            self.mean[rows] += delta * share
+            self.m2[rows] += m2 + delta * delta * n_a * share
+        self.count[rows] = total
+
+    def update(self, key, power, ratio):
+        """Add a single reading (Welford's update); NaN values are skipped."""
+        row = self._rows_for([key])[0]
+        for column, value in enumerate((power, ratio)):
+            if np.isnan(value):
+                continue
+            self.count[row, column] += 1
+            delta = value - self.mean[row, column]
+            self.mean[row, column] += delta / self.count[row, column]
+            self.m2[row, column] += delta * (value - self.mean[row, column])
+
+    def update_batch(self, keys, power, ratio):
+        """Add many readings at once; ``keys`` gives each reading's panel."""
+        codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+        if len(uniques) == 0:
+            return self
+        rows = self._rows_for(list(uniques))
+        n_groups = len(uniques)
+        count = np.zeros((n_groups, len(METRICS)))
+        mean = np.zeros((n_groups, len(METRICS)))
+        m2 = np.zeros((n_groups, len(METRICS)))
+        for column, values in enumerate((power, ratio)):
+            values = np.asarray(values, dtype=np.float64)
+            valid = ~np.isnan(values) & (codes >= 0)
+            c, v = codes[valid], values[valid]
+            n = np.bincount(c, minlength=n_groups).astype(np.float64)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mu = np.bincount(c, weights=v, minlength=n_groups) / n
+            mu = np.where(n > 0, mu, 0.0)
+            dev = v - mu[c]
+            count[:, column] = n
+            mean[:, column] = mu
+            m2[:, column] = np.bincount(c, weights=dev * dev, minlength=n_groups)
+        self._combine(rows, count, mean, m2)
+        return self
+
+    def merge(self, other):
+        """Fold another shard's statistics into this one."""
+        if len(other):
+            self._combine(self._rows_for(other.keys), other.count, other.mean, other.m2)
+        return self
+
+    @classmethod
+    def from_frame(cls, df, group_key):
+        return cls().update_batch(df[group_key], df['DC_POWER'], df['power_ratio'])
+
+    def to_frame(self, group_key):
+        """Per-panel mean and sample std, laid out like the fault detection table."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        std[self.count < 2] = np.nan
+        mean = np.where(self.count > 0, self.mean, np.nan)
+        out = {group_key: self.keys}
+        for column, name in enumerate(METRICS.values()):
+            out[f'{name}_mean'] = mean[:, column]
+            out[f'{name}_std'] = std[:, column]
+        return pd.DataFrame(out)
+
+
+def faulty_panels(panel_stats, threshold):
+    """Panels whose mean power or ratio is more than ``threshold`` std devs from the fleet."""
+    flagged = np.zeros(len(panel_stats), dtype=bool)
+    for column in ('power_mean', 'ratio_mean'):
+        values = panel_stats[column]
+        flagged |= (values - values.mean()).abs().to_numpy() > threshold * values.std()
+    return panel_stats[flagged]
@@ -0,0 +1,146 @@
+"""Per-rerun stage timings for the dashboards.
+
+An app creates one ``StageTimer`` per script run and wraps its steps in
+``timer.stage(name)`` (or, in flat scripts, marks the start of each part
+with ``timer.section(name)``). Library code marks its own expensive steps with
+``stage()`` / ``@timed()``, which record into the timer of the run that
+is executing (Streamlit runs each session in its own thread) and cost
+nothing when no timer is active. Each stage records wall time, the
+change in resident memory and, when the caller sets it, a row count.
+
+``timer.report()`` appends the run to ``perf.log`` (JSON lines) and,
+when the sidebar checkbox is ticked, shows the table in the sidebar.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+LOG_PATH = os.environ.get('DASHBOARD_PERF_LOG', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '.cache', 'perf.log'))
+
+_active = threading.local()
+_logger = logging.getLogger('dashboard.perf')
+
+
+def _rss():
+    """Resident set size in bytes, or None where it cannot be read."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _log():
+    if not _logger.handlers:
+        os.makedirs(os.path.dirname(LOG_PATH) or '.', exist_ok=True)
+        handler = logging.FileHandler(LOG_PATH)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+    return _logger
+
+
+class StageTimer:
+    """Stage records for one run of ``app``; becomes the thread's active timer."""
+
+    def __init__(self, app):
+        self.app = app
+        self.run_id = uuid.uuid4().hex[:8]
+        self.records = []
+        self._depth = 0
+        self._section = None
+        self._start = time.perf_counter()
+        _active.timer = self
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Time the block; the yielded dict's ``rows`` may be set inside it."""
+        record = {'stage': name, 'depth': self._depth, 'rows': rows}
+        self.records.append(record)
+        self._depth += 1
+        before = _rss()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            after = _rss()
+            record['mem_delta_mb'] = None if before is None or after is None else (after - before) / 2 ** 20
+            self._depth -= 1
+
+    def section(self, name, rows=None):
+        """Start a stage that lasts until the next ``section`` call or ``report``."""
+        self._close_section()
+        self._section = self.stage(name, rows)
+        return self._section.__enter__()
+
+    def _close_section(self):
+        if self._section is not None:
+            self._section.__exit__(None, None, None)
+            self._section = None
+
+    def frame(self):
+        return pd.DataFrame(self.records, columns=['stage', 'depth', 'seconds', 'rows', 'mem_delta_mb'])
+
+    def report(self, st=None):
+        """Log this run and, if enabled in the sidebar, show the stage table."""
+        self._close_section()
+        total = time.perf_counter() - self._start
+        log = _log()
+        for record in self.records:
+            log.info(json.dumps({'app': self.app, 'run': self.run_id, **record}))
+        log.info(json.dumps({'app': self.app, 'run': self.run_id, 'stage': 'total', 'seconds': total}))
+        if getattr(_active, 'timer', None) is self:
+            del _active.timer
+
+        if st is not None and st.sidebar.checkbox('Show performance panel'):
+            with st.sidebar.expander('Performance', expanded=True):
+                table = self.frame()
+                table['stage'] = ['  ' * depth + name for depth, name in zip(table['depth'], table['stage'])]
+                st.dataframe(table.drop(columns='depth').style.format(
+                    {'seconds': '{:.3f}', 'mem_delta_mb': '{:+.1f}', 'rows': '{:,.0f}'}, na_rep=''),
+                    hide_index=True)
+                st.caption(f'Run {self.run_id}: {total:.2f} s total, logged to {LOG_PATH}')
+
+
+@contextmanager
+def stage(name, rows=None):
+    """``StageTimer.stage`` on the active timer; a no-op outside an instrumented run."""
+    timer = getattr(_active, 'timer', None)
+    if timer is None:
+        yield {'stage': name, 'rows': rows}
+        return
+    with timer.stage(name, rows) as record:
+        yield record
+
+
+def timed(name=None):
+    """Decorator form of ``stage``; rows are taken from a returned frame's length."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(label) as record:
+                result = func(*args, **kwargs)
+                if hasattr(result, '__len__') and hasattr(result, 'columns'):
+                    record['rows'] = len(result)
+                return result
+        return wrapper
+    return decorate
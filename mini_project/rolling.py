@@ -0,0 +1,110 @@
+"""Grouped rolling statistics computed in one vectorized pass.
+
+Rows are stably sorted by group so every inverter's readings form one
+contiguous block, in their original order. Window sums come from cumulative
+sums clipped at the block start, and rolling min/max use pandas' grouped
+rolling kernels on the sorted block layout, so no Python code runs per
+group. Results are aligned back to the input order and match
+``groupby(...).transform(lambda x: x.rolling(window, min_periods).<stat>())``.
+"""
+import numpy as np
+import pandas as pd
+
+STATS = ['mean', 'std', 'min', 'max']
+
+
+def _group_codes(groups):
+    if isinstance(groups, pd.Series) and isinstance(groups.dtype, pd.CategoricalDtype):
+        codes = groups.cat.codes.to_numpy()
+        # Missing keys (-1) become their own group after the real categories.
+        return np.where(codes < 0, len(groups.cat.categories), codes)
+    codes, _ = pd.factorize(groups, use_na_sentinel=False)
+    return codes
+
+
+def _block_layout(groups):
+    codes = _group_codes(groups)
+    if len(codes) and codes.max() < np.iinfo(np.int16).max:
+        codes = codes.astype(np.int16)  # lets the stable argsort use radix sort
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    block_start = np.repeat(starts, np.diff(np.r_[starts, len(codes)]))
+    return order, sorted_codes, block_start
+
+
+def _cumulative(values):
+    out = np.empty(len(values) + 1)
+    out[0] = 0.0
+    np.cumsum(values, out=out[1:])
+    return out
+
+
+def _window_sum(cumulative, lo, hi):
+    return cumulative[hi] - cumulative[lo]
+
+
+def grouped_rolling(values, groups, window, stats=('mean',), min_periods=1):
+    """Rolling ``stats`` of ``values`` within each group, as a dict of arrays.
+
+    NaN readings are skipped and a window with fewer than ``min_periods``
+    valid readings yields NaN, as in pandas.
+    """
+    unknown = set(stats) - set(STATS)
+    if unknown:
+        raise ValueError(f'unsupported rolling statistics: {sorted(unknown)}')
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return {stat: np.empty(0) for stat in stats}
+    order, sorted_codes, block_start = _block_layout(groups)
+    v = values[order]
+    valid = ~np.isnan(v)
+
+    position = np.arange(n)
+    lo = np.maximum(position - window + 1, block_start)
+    hi = position + 1
+
+    count = _window_sum(_cumulative(valid), lo, hi)
+    enough = count >= max(min_periods, 1)
+    results = {}
+
+    if 'mean' in stats or 'std' in stats:
+        # Centre each block on its own mean so long cumulative sums stay accurate.
+        filled = np.where(valid, v, 0.0)
+        block_sum = np.bincount(sorted_codes, weights=filled)
+        block_count = np.bincount(sorted_codes, weights=valid)
+        centre = (block_sum / np.maximum(block_count, 1))[sorted_codes]
+        filled = np.where(valid, v - centre, 0.0)
+        total = _window_sum(_cumulative(filled), lo, hi)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            if 'mean' in stats:
+                results['mean'] = np.where(enough, mean + centre, np.nan)
+            if 'std' in stats:
+                squares = _window_sum(_cumulative(filled * filled), lo, hi)
+                var = np.maximum(squares - total * mean, 0.0) / (count - 1)
+                results['std'] = np.where(enough & (count > 1), np.sqrt(var), np.nan)
+
+    for stat in ('min', 'max'):
+        if stat in stats:
+            rolled = getattr(pd.Series(v).groupby(sorted_codes, sort=False)
+                             .rolling(window, min_periods=min_periods), stat)()
+            results[stat] = rolled.to_numpy()
+
+    aligned = {}
+    for stat in stats:
+        out = np.empty(n)
+        out[order] = results[stat]
+        aligned[stat] = out
+    return aligned
+
+
+def add_rolling_columns(df, value, group, window, stats=('mean',), prefix=None, min_periods=1):
+    """Add ``<prefix>_<stat>`` columns to ``df`` in place (prefix defaults to ``value``)."""
+    rolled = grouped_rolling(df[value].to_numpy(dtype=np.float64, na_value=np.nan), df[group],
+                             window, stats, min_periods)
+    prefix = prefix or value
+    for stat, result in rolled.items():
+        df[f'{prefix}_{stat}'] = result
+    return df
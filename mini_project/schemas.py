@@ -0,0 +1,223 @@
+"""Declared layout of every CSV the dashboards read.
+
+``SCHEMAS`` lists each dataset's columns and dtypes, keyed by the same
+names the loaders use (plant file kinds and the energy file stems).
+Timestamp columns have no fixed format here: the format is detected from
+a small sample against ``TIMESTAMP_FORMATS`` and remembered per value
+shape (digits masked), so later files with the same layout skip detection.
+Only distinct timestamps are parsed - plant files repeat each one per
+inverter - and values no known format accepts go through a vectorized
+digit-split fallback.
+
+``check_upload`` validates the first ``SAMPLE_ROWS`` rows, so a wrong or
+broken file is rejected before the full parse starts. A bad value further
+down still fails the typed read; ``read_csv`` and ``read_chunks`` turn that
+into a SchemaError naming the column and value too.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+TIMESTAMP = 'timestamp'
+
+# Plant 1 generation data uses day-first timestamps, everything else is ISO.
+TIMESTAMP_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%d-%m-%Y %H:%M', '%d-%m-%Y %H:%M:%S']
+
+SAMPLE_ROWS = 200
+
+SCHEMAS = {
+    'Generation': {
+        'DATE_TIME': TIMESTAMP, 'PLANT_ID': 'int64', 'SOURCE_KEY': 'category',
+        'DC_POWER': 'float64', 'AC_POWER': 'float64', 'DAILY_YIELD': 'float64', 'TOTAL_YIELD': 'float64',
+    },
+    'Weather_Sensor': {
+        'DATE_TIME': TIMESTAMP, 'PLANT_ID': 'int64', 'SOURCE_KEY': 'category',
+        'AMBIENT_TEMPERATURE': 'float64', 'MODULE_TEMPERATURE': 'float64', 'IRRADIATION': 'float64',
+    },
+    'EnergyReq': {
+        'Year': 'int64', 'State': 'str', 'Requirement (MU)': 'float64', 'Availability (MU)': 'float64',
+    },
+    'HydroInflowandGen': {
+        'Year': 'int64', 'RESERVOIR SCHEME': 'str', 'INFLOWS (MCM)': 'float64', 'GENERATION (GWH)': 'float64',
+    },
+    'InterstateEnergyTransfer': {
+        'Year': 'int64', 'NAME OF SUPPLIER': 'str', 'NAME OF PURCHASER': 'str',
+        'ENERGRY TRANSFERED (GWH)': 'float64',
+    },
+}
+
+_formats_by_shape = {}
+
+
+class SchemaError(ValueError):
+    """An input file does not match its declared schema."""
+
+
+def read_dtypes(kind):
+    """``dtype=`` mapping for ``pd.read_csv``; timestamp columns are parsed separately."""
+    return {column: dtype for column, dtype in SCHEMAS[kind].items() if dtype != TIMESTAMP}
+
+
+def timestamp_columns(kind):
+    return [column for column, dtype in SCHEMAS[kind].items() if dtype == TIMESTAMP]
+
+
+def _shape(value):
+    return re.sub(r'\d', '9', str(value))
+
+
+def _sample(values):
+    values = values.dropna()
+    step = max(1, len(values) // SAMPLE_ROWS)
+    return values.iloc[::step].iloc[:SAMPLE_ROWS]
+
+
+def detect_format(values):
+    """First of ``TIMESTAMP_FORMATS`` that parses a sample of ``values``, or None."""
+    sample = _sample(pd.Series(values))
+    if sample.empty:
+        return None
+    shape = _shape(sample.iloc[0])
+    known = _formats_by_shape.get(shape)
+    for fmt in ([known] if known else []) + TIMESTAMP_FORMATS:
+        try:
+            pd.to_datetime(sample, format=fmt)
+        except (TypeError, ValueError):
+            continue
+        _formats_by_shape[shape] = fmt
+        return fmt
+    return None
+
+
+def split_digits(values, dayfirst=True):
+    """Vectorized fallback: split on non-digits and assemble the date fields.
+
+    A leading field above 31 is read as year-month-day; otherwise the
+    year is last and the order is day-month unless ``dayfirst`` is False
+    or the second field exceeds 12. Unparseable values become NaT.
+    """
+    fields = values.astype(str).str.split(r'\D+', regex=True, expand=True)
+    fields = fields.apply(pd.to_numeric, errors='coerce')
+    fields = fields.reindex(columns=range(6))
+    if fields[0].max() > 31:
+        year, month, day = fields[0], fields[1], fields[2]
+    elif dayfirst and not fields[1].max() > 12:
+        day, month, year = fields[0], fields[1], fields[2]
+    else:
+        month, day, year = fields[0], fields[1], fields[2]
+    return pd.to_datetime(pd.DataFrame({
+        'year': year, 'month': month, 'day': day,
+        'hour': fields[3].fillna(0), 'minute': fields[4].fillna(0), 'second': fields[5].fillna(0),
+    }), errors='coerce')
+
+
+def parse_timestamps(values, fmt=None):
+    """Parse a string column, each distinct value once.
+
+    Uses ``fmt`` when given, otherwise the detected format; falls back to
+    ``split_digits`` when no fixed format fits every value.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques)
+    fmt = fmt or detect_format(uniques)
+    parsed = None
+    if fmt is not None:
+        try:
+            parsed = pd.to_datetime(uniques, format=fmt)
+        except (TypeError, ValueError):
+            parsed = None
+    if parsed is None:
+        parsed = split_digits(uniques)
+    out = parsed.to_numpy()[np.maximum(codes, 0)]
+    out[codes < 0] = np.datetime64('NaT')
+    return pd.Series(out, index=getattr(values, 'index', None), name=getattr(values, 'name', None))
+
+
+def validate(df, kind):
+    """Check a (sample) frame against ``SCHEMAS[kind]``; returns {timestamp column: format}.
+
+    Raises SchemaError naming every missing column, non-numeric value in a
+    numeric column and unparseable timestamp column.
+    """
+    schema = SCHEMAS[kind]
+    problems = []
+    missing = [column for column in schema if column not in df.columns]
+    if missing:
+        problems.append(f'missing columns {missing}')
+    formats = {}
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if dtype == TIMESTAMP:
+            formats[column] = detect_format(values)
+            if formats[column] is None and split_digits(_sample(values)).isna().any():
+                problems.append(f'{column!r} has timestamps in no recognised format, e.g. {values.iloc[0]!r}')
+        elif dtype in ('int64', 'float64'):
+            numbers = pd.to_numeric(values, errors='coerce')
+            bad = values[numbers.isna() & values.notna()]
+            if len(bad):
+                problems.append(f'{column!r} should be numeric, found {bad.iloc[0]!r}')
+    if problems:
+        raise SchemaError(f'{kind} data: ' + '; '.join(problems))
+    return formats
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
+
+def check_upload(source, kind):
+    """Validate the first rows of a path or file-like upload before it is read in full."""
+    name = getattr(source, 'name', source)
+    try:
+        head = pd.read_csv(_rewind(source), nrows=SAMPLE_ROWS, dtype=str)
+    except (pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError) as exc:
+        raise SchemaError(f'{kind} data: cannot read {name}: {exc}') from exc
+    finally:
+        _rewind(source)
+    if head.empty:
+        raise SchemaError(f'{kind} data: {name} has no rows')
+    return validate(head, kind)
+
+
+def _read_error(source, kind, exc):
+    """SchemaError for a typed read of ``source`` that raised ``exc``, naming the first bad value."""
+    name = getattr(source, 'name', source)
+    try:
+        # Only reached on failure, so re-reading the whole file as text is affordable.
+        validate(pd.read_csv(_rewind(source), dtype=str), kind)
+    except SchemaError as found:
+        return found
+    except ValueError:
+        pass
+    finally:
+        _rewind(source)
+    return SchemaError(f'{kind} data: cannot read {name}: {exc}')
+
+
+def read_csv(source, kind, **kwargs):
+    """Validated, typed read of a whole file, timestamp columns parsed."""
+    formats = check_upload(source, kind)
+    try:
+        df = pd.read_csv(_rewind(source), dtype=read_dtypes(kind), **kwargs)
+    except ValueError as exc:
+        raise _read_error(source, kind, exc) from exc
+    for column, fmt in formats.items():
+        df[column] = parse_timestamps(df[column], fmt)
+    return df
+
+
+def read_chunks(source, kind, chunksize):
+    """Typed read of ``source`` ``chunksize`` rows at a time; timestamps are left as text.
+
+    Call ``check_upload`` first. A value the dtypes reject raises SchemaError.
+    """
+    with pd.read_csv(_rewind(source), chunksize=chunksize, dtype=read_dtypes(kind)) as reader:
+        try:
+            yield from reader
+        except ValueError as exc:
+            raise _read_error(source, kind, exc) from exc
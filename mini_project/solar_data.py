@@ -0,0 +1,239 @@
+"""Cached loading of the solar plant generation and weather sensor CSVs.
+
+Each CSV is validated and parsed once (see ``schemas``), stored as a typed columnar copy under ``.cache/``
+keyed by the file's content hash and mtime, and memoized in-process so every
+dashboard rerun (and every dashboard sharing the server) reuses it.
+Frames returned from here are shared: copy before mutating.
+"""
+import glob
+import hashlib
+import os
+import re
+from functools import lru_cache
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from perf import stage, timed
+from schemas import SchemaError, _rewind, check_upload, parse_timestamps, read_chunks, read_csv
+
+try:
+    import pyarrow  # noqa: F401
+    COLUMNAR_EXT = '.parquet'
+except ImportError:
+    COLUMNAR_EXT = '.pkl'
+
+DATA_DIR = os.environ.get('SOLAR_DATA_DIR', os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+GEN_COLUMNS = ['DC_POWER', 'AC_POWER', 'DAILY_YIELD', 'TOTAL_YIELD']
+SENS_COLUMNS = ['IRRADIATION', 'MODULE_TEMPERATURE', 'AMBIENT_TEMPERATURE']
+
+# Columns stored as float32 when generation and weather uploads are merged.
+# Yields are cumulative meter readings and keep float64 precision.
+COMPACT_FLOATS = ['DC_POWER', 'AC_POWER', 'AMBIENT_TEMPERATURE', 'MODULE_TEMPERATURE', 'IRRADIATION']
+
+# Float columns that keep float64 in ``compact_frame``.
+PRECISE_FLOATS = ['DAILY_YIELD', 'TOTAL_YIELD']
+
+MERGE_CHUNKSIZE = 200_000
+
+_fingerprints = {}
+
+
+def plant_path(plant_id, kind='Generation'):
+    """Path of a plant file, ``kind`` is 'Generation' or 'Weather_Sensor'."""
+    return os.path.join(DATA_DIR, f'Plant_{plant_id}_{kind}_Data.csv')
+
+
+def available_plants(kind='Generation'):
+    pattern = os.path.join(DATA_DIR, f'Plant_*_{kind}_Data.csv')
+    ids = []
+    for path in glob.glob(pattern):
+        match = re.search(r'Plant_(\d+)_', os.path.basename(path))
+        if match:
+            ids.append(int(match.group(1)))
+    return sorted(ids)
+
+
+def file_fingerprint(path):
+    """Content hash plus mtime; the hash is only recomputed when size or mtime change."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _fingerprints:
+        digest = hashlib.sha1()
+        with open(path, 'rb') as fh:
+            for block in iter(lambda: fh.read(1 << 20), b''):
+                digest.update(block)
+        _fingerprints[key] = f'{digest.hexdigest()[:16]}-{st.st_mtime_ns}'
+    return _fingerprints[key]
+
+
+def _store_path(path, fingerprint, suffix):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f'{name}{suffix}-{fingerprint}{COLUMNAR_EXT}')
+
+
+def read_columnar(path):
+    if COLUMNAR_EXT == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def write_columnar(df, path):
+    """Write atomically, so readers never see a half-written file."""
+    tmp = path + '.tmp'
+    if COLUMNAR_EXT == '.parquet':
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, path)
+
+
+def _write_store(df, store):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Drop copies built from earlier versions of the same source file.
+    prefix = store.rsplit('-', 2)[0]
+    own = re.compile(re.escape(prefix) + r'-[0-9a-f]{16}-\d+' + re.escape(COLUMNAR_EXT))
+    for stale in glob.glob(f'{prefix}-*{COLUMNAR_EXT}'):
+        if stale != store and own.fullmatch(stale):
+            os.remove(stale)
+    write_columnar(df, store)
+
+
+def _kind(path):
+    match = re.search(r'Plant_\d+_(Generation|Weather_Sensor)_Data', os.path.basename(path))
+    if match is None:
+        raise ValueError(f'not a plant data file: {path}')
+    return match.group(1)
+
+
+@timed('parse csv')
+def _parse_raw(path):
+    return read_csv(path, _kind(path))
+
+
+@timed('aggregate generation')
+def _aggregate_generation(raw):
+    return raw.groupby('DATE_TIME', sort=True)[GEN_COLUMNS].sum().reset_index()
+
+
+@lru_cache(maxsize=32)
+def _cached_frame(path, fingerprint, suffix):
+    store = _store_path(path, fingerprint, suffix)
+    if os.path.exists(store):
+        with stage('read columnar cache') as record:
+            df = read_columnar(store)
+            record['rows'] = len(df)
+        return df
+    if suffix == '':
+        df = _parse_raw(path)
+    elif suffix == '-gendaily':
+        df = _aggregate_generation(_cached_frame(path, fingerprint, ''))
+    else:
+        raise ValueError(f'unknown derived frame {suffix!r}')
+    _write_store(df, store)
+    return df
+
+
+def load_raw(path):
+    """Typed raw frame for any plant CSV, DATE_TIME already parsed."""
+    return _cached_frame(os.path.abspath(path), file_fingerprint(path), '')
+
+
+def load_sensor(plant_id):
+    return load_raw(plant_path(plant_id, 'Weather_Sensor'))
+
+
+def load_generation(plant_id):
+    return load_raw(plant_path(plant_id, 'Generation'))
+
+
+def load_generation_daily(plant_id):
+    """Plant-level generation summed over inverters per timestamp.
+
+    Adds DATE and a TIME column that places each reading's time of day on
+    today's date, as the dashboards plot it.
+    """
+    path = plant_path(plant_id, 'Generation')
+    df = _cached_frame(os.path.abspath(path), file_fingerprint(path), '-gendaily').copy()
+    df['DATE'] = df['DATE_TIME'].dt.date
+    today = pd.Timestamp('today').normalize()
+    df['TIME'] = today + (df['DATE_TIME'] - df['DATE_TIME'].dt.normalize())
+    return df
+
+
+def data_version(plant_id, kind='Generation'):
+    return file_fingerprint(plant_path(plant_id, kind))
+
+
+def _downcast(df):
+    for column in COMPACT_FLOATS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('float32')
+    return df
+
+
+@timed('read weather')
+def read_weather_index(source):
+    """Weather readings indexed and sorted by (DATE_TIME, PLANT_ID), ready for joins."""
+    weather = read_csv(_rewind(source), 'Weather_Sensor')
+    return _downcast(weather).set_index(['DATE_TIME', 'PLANT_ID']).sort_index()
+
+
+@timed('merge generation + weather')
+def merge_generation_weather(generation, weather, chunksize=MERGE_CHUNKSIZE):
+    """Inner-join generation readings with weather readings chunk by chunk.
+
+    Generation data is parsed ``chunksize`` rows at a time and each chunk is
+    joined against the indexed weather table, so no full-size intermediate
+    copy of either input is built. Matches ``pd.merge(..., on=['DATE_TIME',
+    'PLANT_ID'], how='inner')`` row for row, with SOURCE_KEY_x/SOURCE_KEY_y
+    as categoricals and power/sensor columns as float32. Both uploads are
+    checked against their schema first and a mismatch, or no reading in
+    common, raises SchemaError.
+    """
+    fmt = check_upload(generation, 'Generation')['DATE_TIME']
+    weather_index = read_weather_index(weather)
+    chunks = []
+    for chunk in read_chunks(generation, 'Generation', chunksize):
+        chunk['DATE_TIME'] = parse_timestamps(chunk['DATE_TIME'], fmt)
+        chunk = _downcast(chunk)
+        chunks.append(chunk.join(weather_index, on=['DATE_TIME', 'PLANT_ID'], how='inner',
+                                 lsuffix='_x', rsuffix='_y'))
+    if not any(len(chunk) for chunk in chunks):
+        raise SchemaError('Generation and weather data: no overlapping timestamps')
+    # Chunks see different inverter keys; align them so the concat stays categorical.
+    keys = union_categoricals([chunk['SOURCE_KEY_x'] for chunk in chunks]).categories
+    for chunk in chunks:
+        chunk['SOURCE_KEY_x'] = chunk['SOURCE_KEY_x'].cat.set_categories(keys)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def compact_frame(df):
+    """Shrink a merged (and featurized) frame to compact dtypes.
+
+    Text columns with repeated values become categoricals, integer columns
+    the smallest integer type that fits, floats other than ``PRECISE_FLOATS``
+    float32, and SOURCE_KEY_y (the weather sensor, one per plant) is dropped
+    when SOURCE_KEY_x is present. Returns (frame, bytes before, bytes after).
+    """
+    before = frame_bytes(df)
+    if 'SOURCE_KEY_x' in df.columns and 'SOURCE_KEY_y' in df.columns:
+        df = df.drop(columns='SOURCE_KEY_y')
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_bool_dtype(values) or isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(values):
+            df[column] = pd.to_numeric(values, downcast='integer')
+        elif pd.api.types.is_float_dtype(values) and column not in PRECISE_FLOATS:
+            df[column] = values.astype('float32')
+        elif (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)) \
+                and values.nunique() < len(values) // 2:
+            df[column] = values.astype('category')
+    return df, before, frame_bytes(df)
@@ -0,0 +1,188 @@
+"""Training backend and train-once registry for app3's power prediction model.
+
+A model is identified by a fingerprint of the uploaded generation and
+weather files, the feature list and the engine settings. The fitted model,
+its predictions and its metrics are kept in memory and persisted with joblib
+under ``.cache/models/``, so reruns and new sessions reload instead of
+refitting. Both caches are bounded: the ``LOADED_MODELS`` most recently used
+entries stay in memory and the ``SAVED_MODELS`` most recently used files on
+disk. scikit-learn is imported when a model is first trained or loaded.
+"""
+import glob
+import hashlib
+import io
+import json
+import os
+import time
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+
+from perf import timed
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'models')
+
+# Bump when the feature pipeline changes so stale models are not reused.
+PIPELINE_VERSION = 3
+
+# Worker processes that each fit their own model set this to 1 (see fleet.py).
+N_JOBS = -1
+
+
+def _random_forest(max_depth, max_leaf_nodes):
+    from sklearn.ensemble import RandomForestRegressor
+    return RandomForestRegressor(n_estimators=100, max_depth=max_depth, max_leaf_nodes=max_leaf_nodes,
+                                 n_jobs=N_JOBS, random_state=42)
+
+
+def _hist_gradient_boosting(max_depth, max_leaf_nodes):
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    return HistGradientBoostingRegressor(max_iter=200, max_depth=max_depth,
+                                         max_leaf_nodes=max_leaf_nodes or 31, random_state=42)
+
+
+ENGINES = {
+    'Random Forest': _random_forest,
+    'Histogram Gradient Boosting': _hist_gradient_boosting,
+}
+
+MODEL_PARAMS = {'engine': 'Random Forest', 'max_depth': None, 'max_leaf_nodes': None}
+
+# Inputs of the power model, in app3, fleet mode, batch runs and the benchmarks.
+FEATURES = ['AMBIENT_TEMPERATURE', 'MODULE_TEMPERATURE', 'IRRADIATION', 'hour', 'month', 'day_of_week']
+
+TEST_SIZE = 0.2
+
+# A fitted forest with its predictions is tens of MB; keep only a few in memory.
+LOADED_MODELS = 4
+SAVED_MODELS = 32
+
+_loaded = OrderedDict()
+
+
+def fingerprint(*sources, features, params=MODEL_PARAMS):
+    """Stable key for raw file contents (bytes) plus the model configuration."""
+    digest = hashlib.sha1()
+    for source in sources:
+        digest.update(hashlib.sha1(source).digest())
+    digest.update(json.dumps([PIPELINE_VERSION, list(features), params], sort_keys=True).encode())
+    return digest.hexdigest()[:24]
+
+
+def plant_model_key(generation, weather, params=MODEL_PARAMS, outliers=None):
+    """Registry key for the model of one plant's generation and weather file contents (bytes).
+
+    app3, fleet mode and batch runs all build keys here, so a model fitted
+    by one is reused by the others.
+    """
+    return fingerprint(generation, weather, features=FEATURES, params={**params, 'outliers': outliers})
+
+
+def _model_path(key):
+    return os.path.join(MODEL_DIR, f'{key}.joblib')
+
+
+def _remember(key, entry):
+    _loaded[key] = entry
+    _loaded.move_to_end(key)
+    while len(_loaded) > LOADED_MODELS:
+        _loaded.popitem(last=False)
+
+
+def _prune_saved():
+    """Delete all but the ``SAVED_MODELS`` most recently used model files."""
+    paths = glob.glob(os.path.join(MODEL_DIR, '*.joblib'))
+    for path in sorted(paths, key=os.path.getmtime)[:-SAVED_MODELS]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load(key, n_rows):
+    """Cached training result for ``key``, or None when absent or stale."""
+    entry = _loaded.get(key)
+    if entry is None and os.path.exists(_model_path(key)):
+        try:
+            entry = joblib.load(_model_path(key))
+            # The modification time marks use, so pruning keeps models that are still read.
+            os.utime(_model_path(key))
+        except (OSError, EOFError, ValueError):
+            return None
+    if entry is None or (n_rows is not None and len(entry['predictions']) != n_rows):
+        return None
+    _remember(key, entry)
+    return entry
+
+
+def save(key, entry):
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    tmp = _model_path(key) + '.tmp'
+    joblib.dump(entry, tmp)
+    os.replace(tmp, _model_path(key))
+    _remember(key, entry)
+    _prune_saved()
+
+
+def model_size(model):
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    return buf.tell()
+
+
+@timed('train model')
+def train(X, y, engine='Random Forest', max_depth=None, max_leaf_nodes=None):
+    """Fit on a training split and score on the held-out rows.
+
+    Returns a dict with the model, predictions for every row of ``X``, the
+    per-feature importances and fit/predict timings, model size and held-out
+    R2/RMSE.
+    """
+    from sklearn.inspection import permutation_importance
+    from sklearn.metrics import mean_squared_error, r2_score
+    from sklearn.model_selection import train_test_split
+
+    model = ENGINES[engine](max_depth, max_leaf_nodes)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=42)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = model.predict(X)
+    predict_time = time.perf_counter() - start
+
+    held_out = model.predict(X_test)
+    if hasattr(model, 'feature_importances_'):
+        importances = model.feature_importances_
+    else:
+        sample = min(len(X_test), 2000)
+        importances = permutation_importance(model, X_test[:sample], y_test[:sample], n_repeats=3,
+                                             random_state=42, n_jobs=N_JOBS).importances_mean
+    return {
+        'model': model,
+        'predictions': predictions,
+        'importances': importances,
+        'metrics': {
+            'engine': engine,
+            'fit_time': fit_time,
+            'predict_time': predict_time,
+            'model_bytes': model_size(model),
+            'r2': r2_score(y_test, held_out),
+            'rmse': float(np.sqrt(mean_squared_error(y_test, held_out))),
+            'train_rows': len(X_train),
+            'test_rows': len(X_test),
+        },
+    }
+
+
+def get_or_train(key, X, y, params=MODEL_PARAMS):
+    """Return (result, reused) where result is as returned by ``train``."""
+    cached = load(key, len(X))
+    if cached is not None:
+        return cached, True
+    result = train(X, y, **params)
+    save(key, result)
+    return result, False
@@ -0,0 +1,162 @@
+"""Registry-driven chart rendering for the solar plant dashboards.
+
+Every (dataset, chart type) pair is declared once in ``DATASETS`` and drawn by
+one of a handful of generic renderers, so adding a plant or a chart never
+means another copy-pasted branch. Rendered PNGs are cached per plant, chart
+type, outlier filter and data version. matplotlib is imported on the first
+render and seaborn only by the chart types drawn with it.
+"""
+import io
+from functools import lru_cache
+
+from cleaning import outlier_rows
+from downsample import sample_for_width
+from perf import timed
+from solar_data import (GEN_COLUMNS, SENS_COLUMNS, data_version,
+                        load_generation_daily, load_sensor)
+
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    """matplotlib.pyplot on the Agg backend, imported on the first chart render."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+CHART_TYPES = ['Line Plot', 'Histogram', 'Scatter Plot', 'Correlation Matrix', 'Box Plot', 'Pair Plot']
+
+
+def series_panels(df, plant, x, panels, xlabel, figsize, width_px=None):
+    fig, ax = _pyplot().subplots(len(panels), 1, figsize=figsize)
+    for axis, (column, color, label) in zip(ax, panels):
+        points = df if width_px is None else sample_for_width(df, x, column, width_px)
+        axis.plot(points[x], points[column], '.', color=color)
+        axis.set_title(f'{label} for Plant {plant}')
+        axis.set_xlabel(xlabel)
+        axis.set_ylabel(label)
+    return fig
+
+
+def histogram(df, plant, series, title, xlabel):
+    fig, ax = _pyplot().subplots(figsize=(10, 6))
+    for column, color, label in series:
+        ax.hist(df[column], bins=30, color=color, alpha=0.7, label=label)
+    ax.set_title(f'{title} for Plant {plant}')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Frequency')
+    ax.legend()
+    return fig
+
+
+def xy_scatter(df, plant, x, y, title, xlabel, ylabel):
+    fig, ax = _pyplot().subplots(figsize=(10, 6))
+    ax.scatter(df[x], df[y], color='purple', alpha=0.5)
+    ax.set_title(f'{title} for Plant {plant}')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    return fig
+
+
+def correlation(df, plant, columns, title):
+    import seaborn as sbn
+
+    fig, ax = _pyplot().subplots(figsize=(8, 6))
+    sbn.heatmap(df[columns].corr(), annot=True, fmt=".2f", cmap='coolwarm', ax=ax)
+    ax.set_title(title.format(plant=plant))
+    return fig
+
+
+def box(df, plant, columns, title, ylabel):
+    import seaborn as sbn
+
+    fig, ax = _pyplot().subplots(figsize=(10, 6))
+    sbn.boxplot(data=df[columns], ax=ax)
+    ax.set_title(f'{title} for Plant {plant}')
+    ax.set_ylabel(ylabel)
+    return fig
+
+
+def pair(df, plant, columns):
+    import seaborn as sbn
+
+    _pyplot()
+    return sbn.pairplot(df[columns]).figure
+
+
+DATASETS = {
+    'Generation Data': {
+        'kind': 'Generation',
+        'load': load_generation_daily,
+        'clean': dict(columns=GEN_COLUMNS, by='TIME'),
+        'charts': {
+            'Scatter Plot': (series_panels, dict(
+                x='TIME', xlabel='Time of Day', figsize=(10, 8),
+                panels=[('DC_POWER', 'red', 'DC Power'), ('AC_POWER', 'blue', 'AC Power')])),
+            'Histogram': (histogram, dict(
+                title='Histogram of Power Outputs', xlabel='Power Output',
+                series=[('DC_POWER', 'red', 'DC Power'), ('AC_POWER', 'blue', 'AC Power')])),
+            'Line Plot': (xy_scatter, dict(
+                x='DC_POWER', y='AC_POWER', title='Scatter Plot of DC vs AC Power',
+                xlabel='DC Power', ylabel='AC Power')),
+            'Correlation Matrix': (correlation, dict(
+                columns=GEN_COLUMNS, title='Correlation Matrix for Plant {plant}')),
+            'Box Plot': (box, dict(
+                columns=['DC_POWER', 'AC_POWER'], title='Box Plot of Power Outputs',
+                ylabel='Power Output')),
+            'Pair Plot': (pair, dict(columns=GEN_COLUMNS)),
+        },
+    },
+    'Sensor Data': {
+        'kind': 'Weather_Sensor',
+        'load': load_sensor,
+        'clean': dict(columns=SENS_COLUMNS),
+        'charts': {
+            'Line Plot': (series_panels, dict(
+                x='DATE_TIME', xlabel='Time of Day', figsize=(10, 12), width_px=1000,
+                panels=[('IRRADIATION', 'green', 'Irradiation'),
+                        ('MODULE_TEMPERATURE', 'orange', 'Module Temperature'),
+                        ('AMBIENT_TEMPERATURE', 'blue', 'Ambient Temperature')])),
+            'Histogram': (histogram, dict(
+                title='Histogram of Sensor Readings', xlabel='Value',
+                series=[('IRRADIATION', 'green', 'Irradiation'),
+                        ('MODULE_TEMPERATURE', 'orange', 'Module Temperature'),
+                        ('AMBIENT_TEMPERATURE', 'blue', 'Ambient Temperature')])),
+            'Scatter Plot': (xy_scatter, dict(
+                x='IRRADIATION', y='MODULE_TEMPERATURE',
+                title='Scatter Plot of Irradiation vs Module Temperature',
+                xlabel='Irradiation', ylabel='Module Temperature')),
+            'Correlation Matrix': (correlation, dict(
+                columns=SENS_COLUMNS, title='Correlation Matrix for Plant {plant} Sensor Data')),
+            'Box Plot': (box, dict(
+                columns=SENS_COLUMNS, title='Box Plot of Sensor Readings', ylabel='Value')),
+            'Pair Plot': (pair, dict(columns=SENS_COLUMNS)),
+        },
+    },
+}
+
+
+@lru_cache(maxsize=128)
+@timed('render chart png')
+def _render_png(dataset, plant_id, chart_type, outliers, version):
+    spec = DATASETS[dataset]
+    renderer, options = spec['charts'][chart_type]
+    df = spec['load'](plant_id)
+    if outliers is not None:
+        df = df[~outlier_rows(df, outliers, **spec['clean']).to_numpy()]
+    fig = renderer(df, plant_id, **options)
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    _pyplot().close(fig)
+    return buf.getvalue()
+
+
+def render_chart(dataset, plant_id, chart_type, outliers=None):
+    """PNG bytes for a chart; re-rendered only when the plant's file changes.
+
+    ``outliers`` names a ``cleaning.METHODS`` rule whose flagged rows are
+    left out of the chart.
+    """
+    version = data_version(plant_id, DATASETS[dataset]['kind'])
+    return _render_png(dataset, plant_id, chart_type, outliers, version)
@@ -0,0 +1,173 @@
+"""Append-only store of scored solar telemetry for incremental refreshes.
+
+New 15-minute readings are appended as small columnar part files next to
+a persisted state holding everything the dashboard would otherwise
+recompute from full history. The state has each inverter's latest
+timestamp, the last ``window - 1`` power ratios per inverter (enough to
+continue the rolling statistics), per-day sums and counts behind the
+daily trend, and per-panel Welford accumulators behind fault detection.
+Appending a batch costs O(batch), not O(history).
+"""
+import glob
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from panel_stats import PanelStats
+from rolling import grouped_rolling
+from solar_data import CACHE_DIR, COLUMNAR_EXT, read_columnar, write_columnar
+
+STORE_DIR = os.path.join(CACHE_DIR, 'store')
+
+ROLLING_STATS = ('mean', 'std', 'min')
+ROLLING_COLUMNS = {'mean': 'power_ratio_ma', 'std': 'power_ratio_std', 'min': 'power_ratio_min'}
+
+_frames = {}
+
+
+class IncrementalStore:
+    """Persisted history for one plant, keyed by inverter column ``group_key``."""
+
+    def __init__(self, name, group_key, window=48):
+        self.path = os.path.join(STORE_DIR, name)
+        self.group_key = group_key
+        self.window = window
+        self.state = self._load_state()
+
+    def _state_path(self):
+        return os.path.join(self.path, 'state.joblib')
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, f'part-*{COLUMNAR_EXT}')))
+
+    def _load_state(self):
+        if os.path.exists(self._state_path()):
+            state = joblib.load(self._state_path())
+            if state['group_key'] == self.group_key:
+                return state
+        # Parts written under another inverter key (or without a state) cannot be continued.
+        for part in self._parts():
+            os.remove(part)
+        _frames.clear()
+        return {
+            'group_key': self.group_key,
+            'window': self.window,
+            'model_key': None,
+            'rows': 0,
+            'watermark': pd.Series(dtype='datetime64[ns]'),
+            'tail': pd.DataFrame(columns=[self.group_key, 'power_ratio']),
+            'daily_sum': pd.DataFrame(),
+            'daily_count': pd.DataFrame(),
+            'panel': PanelStats(),
+        }
+
+    def _save_state(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self._state_path() + '.tmp'
+        joblib.dump(self.state, tmp)
+        os.replace(tmp, self._state_path())
+
+    @property
+    def model_key(self):
+        return self.state['model_key']
+
+    @model_key.setter
+    def model_key(self, key):
+        self.state['model_key'] = key
+        self._save_state()
+
+    def new_rows(self, data):
+        """Rows of ``data`` newer than what the store already holds for their inverter."""
+        watermark = self.state['watermark']
+        if watermark.empty:
+            return data
+        seen = watermark.reindex(data[self.group_key].astype(object)).to_numpy()
+        return data[pd.isna(seen) | (data['DATE_TIME'].to_numpy() > seen)]
+
+    def append(self, rows):
+        """Persist scored ``rows`` (with predicted_power and power_ratio) and update aggregates."""
+        if self.state['window'] != self.window:
+            self._rebuild_rolling()
+        if rows.empty:
+            return rows
+        rows = rows.sort_values('DATE_TIME', kind='stable').copy()
+        self._add_rolling(rows)
+        self._update_daily(rows)
+        self._update_panels(rows)
+
+        keys = rows[self.group_key].astype(object)
+        latest = rows.groupby(keys)['DATE_TIME'].max()
+        self.state['watermark'] = pd.concat([self.state['watermark'], latest]).groupby(level=0).max()
+
+        os.makedirs(self.path, exist_ok=True)
+        part = os.path.join(self.path, f'part-{len(self._parts()):06d}{COLUMNAR_EXT}')
+        write_columnar(rows, part)
+        self.state['rows'] += len(rows)
+        self._save_state()
+        return rows
+
+    def _add_rolling(self, rows):
+        """Continue the rolling window from each inverter's stored tail."""
+        tail = self.state['tail']
+        key = self.group_key
+        history = pd.concat([tail[[key, 'power_ratio']].astype({key: object}),
+                             rows[[key, 'power_ratio']].astype({key: object})], ignore_index=True)
+        rolled = grouped_rolling(history['power_ratio'].to_numpy(dtype=np.float64),
+                                 history[key], self.window, ROLLING_STATS)
+        for stat, column in ROLLING_COLUMNS.items():
+            rows[column] = rolled[stat][len(tail):]
+        self.state['tail'] = history.groupby(key, sort=False).tail(self.window - 1).reset_index(drop=True)
+
+    def _rebuild_rolling(self):
+        """Recompute rolling columns and daily aggregates over the full history after a window change."""
+        history = self.frame().copy()
+        self.state['window'] = self.window
+        self.state['tail'] = pd.DataFrame(columns=[self.group_key, 'power_ratio'])
+        self.state['daily_sum'], self.state['daily_count'] = pd.DataFrame(), pd.DataFrame()
+        for part in self._parts():
+            os.remove(part)
+        # part-000000 is rewritten with the same row count, so the cached frame key would still match.
+        _frames.clear()
+        if not history.empty:
+            self._add_rolling(history)
+            self._update_daily(history)
+            write_columnar(history, os.path.join(self.path, f'part-{0:06d}{COLUMNAR_EXT}'))
+        self._save_state()
+
+    def _update_daily(self, rows):
+        numeric = rows.select_dtypes('number').drop(columns=['PLANT_ID'], errors='ignore').astype('float64')
+        day = rows['DATE_TIME'].dt.floor('D')
+        sums = numeric.groupby(day).sum()
+        counts = numeric.notna().groupby(day).sum()
+        if not self.state['daily_sum'].empty:
+            sums = sums.add(self.state['daily_sum'], fill_value=0)
+            counts = counts.add(self.state['daily_count'], fill_value=0)
+        self.state['daily_sum'], self.state['daily_count'] = sums, counts
+
+    def _update_panels(self, rows):
+        self.state['panel'].update_batch(rows[self.group_key], rows['DC_POWER'], rows['power_ratio'])
+
+    def frame(self):
+        """Full stored history; cached until the next append."""
+        parts = self._parts()
+        cache_key = (self.path, tuple(parts), self.state['rows'])
+        if cache_key not in _frames:
+            if not parts:
+                return pd.DataFrame()
+            df = pd.concat([read_columnar(part) for part in parts], ignore_index=True)
+            for column in df.columns:
+                if column.startswith('SOURCE_KEY'):
+                    df[column] = df[column].astype('category')
+            _frames.clear()
+            _frames[cache_key] = df
+        return _frames[cache_key]
+
+    def daily(self):
+        """Daily means of every numeric column, as ``resample('D').mean()`` gives."""
+        return (self.state['daily_sum'] / self.state['daily_count']).sort_index()
+
+    def panel_stats(self):
+        """Per-panel mean and sample std of DC power and power ratio."""
+        return self.state['panel'].to_frame(self.group_key)
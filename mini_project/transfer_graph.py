@@ -0,0 +1,80 @@
+"""Supplier -> purchaser network built from InterstateEnergyTransfer.csv.
+
+Supplier and purchaser names are integer-encoded into one shared index and
+each year's transfers become a sparse ``n x n`` matrix (row = supplier,
+column = purchaser, value = GWh). Prefix sums of the yearly matrices make
+any year range a single matrix subtraction, and net flows, top corridors
+and period-over-period deltas are plain sparse matrix reductions.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+SUPPLIER = 'NAME OF SUPPLIER'
+PURCHASER = 'NAME OF PURCHASER'
+ENERGY = 'ENERGRY TRANSFERED (GWH)'
+
+
+class TransferGraph:
+
+    def __init__(self, transfers):
+        supplier = transfers[SUPPLIER].astype(str).str.strip().to_numpy(dtype=object)
+        purchaser = transfers[PURCHASER].astype(str).str.strip().to_numpy(dtype=object)
+        self.entities, codes = np.unique(np.concatenate([supplier, purchaser]), return_inverse=True)
+        src, dst = codes[:len(supplier)], codes[len(supplier):]
+        gwh = transfers[ENERGY].to_numpy(dtype=np.float64)
+        year = transfers['Year'].to_numpy()
+
+        self.years = np.unique(year)
+        n = len(self.entities)
+        # cumulative[k] holds the summed flows of self.years[:k].
+        self._cumulative = [sparse.csr_matrix((n, n))]
+        for y in self.years:
+            mask = year == y
+            yearly = sparse.csr_matrix((gwh[mask], (src[mask], dst[mask])), shape=(n, n))
+            self._cumulative.append(self._cumulative[-1] + yearly)
+
+    def flows(self, first_year, last_year):
+        """Sparse supplier x purchaser GWh summed over first_year..last_year."""
+        lo = np.searchsorted(self.years, first_year, side='left')
+        hi = np.searchsorted(self.years, last_year, side='right')
+        return self._cumulative[max(hi, lo)] - self._cumulative[lo]
+
+    def net_flow(self, first_year, last_year):
+        """Per-entity exports, imports and net import (imports - exports), largest first."""
+        matrix = self.flows(first_year, last_year)
+        exports = np.asarray(matrix.sum(axis=1)).ravel()
+        imports = np.asarray(matrix.sum(axis=0)).ravel()
+        out = pd.DataFrame({'Entity': self.entities, 'Exports (GWH)': exports,
+                            'Imports (GWH)': imports, 'Net Import (GWH)': imports - exports})
+        active = (exports != 0) | (imports != 0)
+        return out[active].sort_values('Net Import (GWH)', ascending=False, ignore_index=True)
+
+    def _top_entries(self, matrix, n, column):
+        coo = matrix.tocoo()
+        if coo.nnz == 0:
+            return pd.DataFrame(columns=['Supplier', 'Purchaser', column])
+        take = min(n, coo.nnz)
+        top = np.argpartition(-np.abs(coo.data), take - 1)[:take]
+        top = top[np.argsort(-np.abs(coo.data[top]), kind='stable')]
+        return pd.DataFrame({'Supplier': self.entities[coo.row[top]],
+                             'Purchaser': self.entities[coo.col[top]],
+                             column: coo.data[top]})
+
+    def top_corridors(self, first_year, last_year, n=10):
+        """The ``n`` largest supplier -> purchaser flows in the period."""
+        return self._top_entries(self.flows(first_year, last_year), n, 'Energy (GWH)')
+
+    def flow_delta(self, before, after, n=10):
+        """Change between two (first_year, last_year) periods.
+
+        Returns the per-entity change in net import and the ``n`` corridors
+        whose flow changed the most.
+        """
+        delta = self.flows(*after) - self.flows(*before)
+        net = np.asarray(delta.sum(axis=0)).ravel() - np.asarray(delta.sum(axis=1)).ravel()
+        by_entity = pd.DataFrame({'Entity': self.entities, 'Net Import Change (GWH)': net})
+        by_entity = by_entity[np.abs(net) > 1e-9].sort_values(
+            'Net Import Change (GWH)', ascending=False, ignore_index=True)
+        delta.eliminate_zeros()
+        return by_entity, self._top_entries(delta, n, 'Change (GWH)')